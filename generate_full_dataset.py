@@ -3,13 +3,27 @@ import argparse
 import os
 import sys
 import time
-from typing import Dict, List, Tuple
-from playwright.sync_api import Page, sync_playwright
-from playwright_stealth import stealth_sync
+import asyncio
+import random
+import signal
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+from playwright.async_api import Page, async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright_stealth import stealth_async
 from openpyxl import Workbook, load_workbook
+import httpx
+import soupsieve
+from bs4 import BeautifulSoup
 import json
 from datetime import datetime
 import traceback
+import logging
+import hashlib
+import sqlite3
+import socket
+from logging.handlers import RotatingFileHandler
+from urllib.parse import urljoin
 
 
 
@@ -22,6 +36,115 @@ CONFIG = {
         "motorcycles": "initial_dataset/motorcycles_makes_and_years.csv",
     },
     "output_file": "full_dataset/vehicle_data.xlsx",
+    # "sqlite" keeps rows in database_file and exports output_file at the end
+    # of a run; "xlsx" writes straight into output_file
+    "storage": "sqlite",
+    "database_file": "full_dataset/vehicle_data.sqlite",
+    # Per make-year fingerprints of the scraped rows, kept across runs.
+    # --scheduled only scrapes make-years that are new or older than ttl_days
+    "schedule_file": "full_dataset/schedule.db",
+    "schedule": {
+        "ttl_days": 30,
+        # Make-years whose rows have not changed for stable_after_days are
+        # only revisited every stable_ttl_days
+        "stable_after_days": 180,
+        "stable_ttl_days": 90,
+    },
+    # Shared make-year queue for --queue; several workers, on one or many
+    # machines, can drain the same file
+    "queue": {
+        "file": "full_dataset/jobs.db",
+        "visibility_timeout": 600,  # Seconds a lease lasts without a heartbeat
+        "heartbeat": 60,  # Seconds between lease renewals
+        "max_attempts": 5,  # Leases per job before it is dead-lettered
+        "poll_interval": 15,  # Seconds an idle worker waits for leases held elsewhere
+    },
+    "site_url": "https://www.jdpower.com",  # Prefix of base_urls, overridable with --base-url
+    "excel_flush": {
+        "rows": 500,  # Save the workbook once this many rows are buffered
+        "seconds": 30,  # ...or when this long has passed since the last save
+    },
+    # What "page ready" means per vehicle type and page kind. Navigation stops at
+    # wait_until, then we wait for selector (or an "undefined undefined" header).
+    # A fallback load state lets legitimately empty pages through.
+    "readiness": {
+        "cars": {
+            "year": {"selector": ".yearMake_model-wrapper-h3__npC2B h3", "timeout": 15000,
+                     "fallback": "networkidle"},
+            "model": {"selector": ".trimSelection_card-info__O02As", "timeout": 60000},
+        },
+        "rvs": {
+            "year": {"selector": "table.table-enhanced--model-years", "timeout": 30000},
+        },
+        "boats": {
+            "year": {"selector": ".MuiGrid-container", "timeout": 15000},
+        },
+        "motorcycles": {
+            "year": {"selector": ".spacing-xs h3.heading-s", "timeout": 60000},
+        },
+    },
+    "readiness_stats_file": "readiness_stats.json",
+    # "json" reads models/trims/specs from the Next.js payloads (__NEXT_DATA__
+    # and JSON responses) and falls back to the DOM selectors when they yield
+    # nothing; "dom" always uses the selectors. The JSON keys in PAYLOAD_FIELDS
+    # have not been checked against the live site yet, so "json" is unverified
+    "extraction_mode": {
+        "cars": "dom",
+        "rvs": "dom",
+        "boats": "dom",
+        "motorcycles": "dom",
+    },
+    # Substrings of response URLs whose JSON bodies are captured in "json" mode
+    "payload_url_patterns": ["/_next/data/", "/api/"],
+    # Hand-written placeholder payloads (<vehicle type>_<page kind>.json) with the
+    # records they must yield; to be replaced with payloads captured from the site
+    "payload_fixtures_folder": "payload_fixtures",
+    "retry": {
+        "base_delay": 5,  # Seconds before the first retry, doubled on each attempt
+        "max_delay": 60,
+    },
+    # "http" fetches the server-rendered HTML with a pooled keep-alive client
+    # instead of driving Firefox; "browser" renders the page in Playwright.
+    # "http" has only been run against saved pages, not the live site
+    "fetch_backend": {
+        "cars": "browser",
+        "rvs": "browser",
+        "boats": "browser",
+        "motorcycles": "browser",
+    },
+    "http": {
+        "max_connections": 20,
+        "timeout": 30,
+        "headers": {
+            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.5",
+        },
+    },
+    "concurrency": 4,  # Make-year jobs scraped at once, one pooled page each
+    "model_tabs_per_make": 4,  # Car model pages of one make-year fetched at once
+    "browser_pool": {
+        "max_navigations": 50,  # Recycle a context after this many page loads
+    },
+    # Requests the browser never needs to fetch. allow_patterns win over the
+    # block rules; blocked requests of a stub_types type get an empty 200
+    # instead of a network error so page scripts don't stall on them
+    "resource_filter": {
+        "enabled": True,
+        "block_types": ["image", "media", "font"],
+        "allow_patterns": [],
+        "deny_patterns": [
+            "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+            "googlesyndication.com", "adservice.google", "facebook.net",
+            "hotjar.com", "newrelic.com", "nr-data.net", "scorecardresearch.com",
+            "quantserve.com", "adsrvr.org", "amazon-adsystem.com", "taboola.com",
+            "outbrain.com", "criteo.", "segment.io", "optimizely.com",
+        ],
+        "stub_types": ["script", "xhr", "fetch"],
+        # Rough size of a response we skipped, for the bytes-saved estimate
+        "estimated_bytes": {"image": 60000, "media": 500000, "font": 40000,
+                            "script": 50000, "other": 5000},
+    },
     "base_urls": {
         "cars": "https://www.jdpower.com/cars/{year}/{make}",
         "rvs": "https://www.jdpower.com/rvs/{year}/{make}",
@@ -30,7 +153,8 @@ CONFIG = {
     },
     "headers": {
         "cars": ["Year", "Vehicle Type", "Make", "Model", "Trim", "Blurb"],
-        "rvs": ["Year", "Vehicle Type", "Make", "Model", "Trim", "Blurb"],
+        "rvs": ["Year", "Vehicle Type", "Make", "Model", "Trim", "Length", "Width", "Coach Design",
+                "Axle(s)", "Weight (lbs)", "Self Cont.", "Slides", "Floor Plan", "Blurb"],
         "boats": ["Year", "Vehicle Type", "Make", "Model", "Length", "Model Type", 
                  "Hull", "CC's", "Engine(s)", "HP", "Weight (lbs)", "Fuel Type", "Blurb"],
         "motorcycles": ["Year", "Vehicle Type", "Make", "Model", "Trim", "Blurb"],
@@ -42,78 +166,95 @@ def sanitize_make(make: str) -> str:
     """Replace spaces and slashes with hyphens and convert to lowercase."""
     return make.replace(' ', '-').replace('/', '-').lower()
 
-def cleanDuplicateHeaders():
-    import openpyxl
-    # Load the workbook and select the 'Bots' worksheet
-    wb = openpyxl.load_workbook('full_dataset/vehicle_data.xlsx')
-    ws = wb['Boats']
-
-    # Define the target values starting from the fourth column
-    target = ["Model", "Length", "Model Type", "Hull", "CC's", 
-            "Engine(s)", "HP", "Weight (lbs)", "Fuel Type"]
-
-    rows_to_delete = []
-    first_occurrence = None
-
-    # Iterate through each row to find matches
-    for row_idx, row in enumerate(ws.iter_rows(min_row=1, values_only=True), start=1):
-        # Check if the row has enough columns and matches the target pattern
-        if len(row) >= 12:
-            # Compare from the 4th column (index 3) to the 12th column (index 11)
-            if list(row[3:12]) == target:
-                if first_occurrence is None:
-                    first_occurrence = row_idx
-                else:
-                    rows_to_delete.append(row_idx)
-
-    # Delete rows in reverse order to avoid shifting issues
-    for row_idx in reversed(rows_to_delete):
-        ws.delete_rows(row_idx)
+class CheckpointManager:
+    """Resume state for the scrape, stored in SQLite.
 
-    # Save the modified workbook
-    wb.save('modified_file.xlsx')
+    Finished make-years sit in an indexed table mirrored by an in-memory
+    set, so ``should_process`` is a set lookup and ``update_progress`` is a
+    single committed insert rather than a rewrite of the whole file. SQLite's
+    journal keeps the file consistent if the process dies mid-write. Error
+    details go to a size-capped rotating log instead of the checkpoint.
+    """
 
-class CheckpointManager:
-    def __init__(self, checkpoint_file="checkpoint.json"):
+    def __init__(self, checkpoint_file="checkpoint.db", error_log_file="checkpoint_errors.log",
+                 legacy_file="checkpoint.json"):
         self.checkpoint_file = checkpoint_file
-        self.state = {
-            'current_vehicle_type': None,
-            'current_make': None,
-            'processed_years': {},
-            'error_log': []
-        }
+        self.error_log_file = error_log_file
+        self.legacy_file = legacy_file
+        self.processed = set()
+        self.conn = None
+        self.error_logger = logging.getLogger("checkpoint.errors")
+        if not self.error_logger.handlers:
+            handler = RotatingFileHandler(error_log_file, maxBytes=5 * 1024 * 1024, backupCount=3,
+                                          encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.error_logger.addHandler(handler)
+            self.error_logger.setLevel(logging.ERROR)
+            self.error_logger.propagate = False
         self.load()
 
     def load(self):
-        if os.path.exists(self.checkpoint_file):
-            try:
-                with open(self.checkpoint_file, 'r') as f:
-                    self.state = json.load(f)
-            except Exception as e:
-                print(f"Error loading checkpoint: {e}. Starting fresh.")
+        self.conn = sqlite3.connect(self.checkpoint_file)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed ("
+            " vehicle_type TEXT NOT NULL, make TEXT NOT NULL, year TEXT NOT NULL,"
+            " processed_at TEXT NOT NULL,"
+            " PRIMARY KEY (vehicle_type, make, year))"
+        )
+        self.conn.commit()
+        self.processed = set(self.conn.execute("SELECT vehicle_type, make, year FROM processed"))
+        self._migrate_legacy()
+
+    def _migrate_legacy(self):
+        """Import progress from the old checkpoint.json once, then set it aside."""
+        if not os.path.exists(self.legacy_file):
+            return
+        try:
+            with open(self.legacy_file, 'r') as f:
+                state = json.load(f)
+        except Exception as e:
+            print(f"Error loading legacy checkpoint: {e}. Ignoring it.")
+            return
+        now = datetime.now().isoformat()
+        rows = []
+        for key, years in state.get('processed_years', {}).items():
+            vehicle_type, _, make = key.partition('-')
+            rows.extend((vehicle_type, make, year, now) for year in years)
+        self.conn.executemany("INSERT OR IGNORE INTO processed VALUES (?, ?, ?, ?)", rows)
+        self.conn.commit()
+        self.processed.update(row[:3] for row in rows)
+        os.replace(self.legacy_file, self.legacy_file + ".migrated")
+        print(f"Migrated {len(rows)} make-year(s) from {self.legacy_file}")
 
     def save(self):
-        with open(self.checkpoint_file, 'w') as f:
-            json.dump(self.state, f)
+        self.conn.commit()
 
     def log_error(self, error_info):
-        self.state['error_log'].append({
+        self.error_logger.error(json.dumps({
             'timestamp': datetime.now().isoformat(),
             'error': error_info
-        })
-        self.save()
+        }))
 
     def update_progress(self, vehicle_type, make, year):
-        key = f"{vehicle_type}-{make}"
-        if key not in self.state['processed_years']:
-            self.state['processed_years'][key] = []
-        if year not in self.state['processed_years'][key]:
-            self.state['processed_years'][key].append(year)
-        self.save()
+        key = (vehicle_type, make, year)
+        if key in self.processed:
+            return
+        self.conn.execute("INSERT OR IGNORE INTO processed VALUES (?, ?, ?, ?)",
+                          key + (datetime.now().isoformat(),))
+        self.conn.commit()
+        self.processed.add(key)
 
     def should_process(self, vehicle_type, make, year):
-        key = f"{vehicle_type}-{make}"
-        return year not in self.state['processed_years'].get(key, [])
+        return (vehicle_type, make, year) not in self.processed
+
+    def clear(self):
+        """Drop the checkpoint after a completed run."""
+        self.conn.close()
+        for path in (self.checkpoint_file, self.checkpoint_file + "-wal", self.checkpoint_file + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
 
 class ErrorHandler:
     @staticmethod
@@ -130,11 +271,377 @@ class ErrorHandler:
         print("Checkpoint saved. Restart script to resume.")
 
 
-class ExcelManager:
+class ScheduleManager:
+    """Remembers when each make-year was last scraped and a fingerprint of its rows.
+
+    The fingerprint is a hash of the sorted row hashes a scrape produced, so
+    it changes when a model or trim appears, disappears or is edited. Unlike
+    the checkpoint it survives a completed run, which lets later runs skip
+    make-years scraped less than ttl_days ago. A make-year whose fingerprint
+    had not changed for stable_after_days when it was last scraped waits
+    stable_ttl_days instead.
+    """
+
+    def __init__(self, schedule_file: str, ttl_days: float, stable_after_days: float = 180,
+                 stable_ttl_days: float = 90):
+        os.makedirs(os.path.dirname(schedule_file) or ".", exist_ok=True)
+        self.ttl = ttl_days * 86400
+        self.stable_after = stable_after_days * 86400
+        self.stable_ttl = max(self.ttl, stable_ttl_days * 86400)
+        self.conn = sqlite3.connect(schedule_file)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS make_years ("
+            " vehicle_type TEXT NOT NULL, make TEXT NOT NULL, year TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL, rows INTEGER NOT NULL,"
+            " scraped_at REAL NOT NULL, changed_at REAL NOT NULL,"
+            " PRIMARY KEY (vehicle_type, make, year))"
+        )
+        self.conn.commit()
+        self.known = {
+            (vehicle_type, make, year): (fingerprint, scraped_at, changed_at)
+            for vehicle_type, make, year, fingerprint, scraped_at, changed_at in self.conn.execute(
+                "SELECT vehicle_type, make, year, fingerprint, scraped_at, changed_at FROM make_years")
+        }
+        self.collecting: Dict[Tuple[str, str, str], set] = {}
+        self.stats = {"new": 0, "changed": 0, "unchanged": 0}
+
+    def is_due(self, vehicle_type: str, make: str, year: str) -> bool:
+        """True if the make-year was never scraped or its last scrape is older than its TTL."""
+        known = self.known.get((vehicle_type, make, year))
+        if known is None:
+            return True
+        _, scraped_at, changed_at = known
+        ttl = self.stable_ttl if scraped_at - changed_at >= self.stable_after else self.ttl
+        return time.time() - scraped_at > ttl
+
+    def begin(self, vehicle_type: str, make: str, year: str):
+        """Start (or restart, on retry) collecting the rows of a make-year."""
+        self.collecting[(vehicle_type, make, year)] = set()
+
+    def observe(self, vehicle_type: str, row: List):
+        """ExcelManager observer: add a scraped row to its make-year's fingerprint."""
+        if len(row) < 3:
+            return
+        rows = self.collecting.get((vehicle_type, str(row[2]), str(row[0])))
+        if rows is not None:
+            rows.add(RowIndex.row_hash(RowIndex.normalize(row)))
+
+    def fingerprint(self, vehicle_type: str, make: str, year: str) -> Tuple[str, int]:
+        """Finish collecting a make-year and return its fingerprint and row count."""
+        rows = self.collecting.pop((vehicle_type, make, year), set())
+        digest = hashlib.blake2b("\n".join(sorted(rows)).encode("utf-8"), digest_size=16).hexdigest()
+        return digest, len(rows)
+
+    def discard(self, vehicle_type: str, make: str, year: str):
+        self.collecting.pop((vehicle_type, make, year), None)
+
+    def record(self, vehicle_type: str, make: str, year: str, fingerprint: str, rows: int):
+        key = (vehicle_type, make, year)
+        now = time.time()
+        previous = self.known.get(key)
+        if previous is None:
+            self.stats["new"] += 1
+            changed_at = now
+        elif previous[0] != fingerprint:
+            self.stats["changed"] += 1
+            changed_at = now
+        else:
+            self.stats["unchanged"] += 1
+            changed_at = previous[2]
+        self.conn.execute("INSERT OR REPLACE INTO make_years VALUES (?, ?, ?, ?, ?, ?, ?)",
+                          key + (fingerprint, rows, now, changed_at))
+        self.conn.commit()
+        self.known[key] = (fingerprint, now, changed_at)
+
+    def report(self):
+        print(f"Make-year fingerprints: {self.stats['new']} new, {self.stats['changed']} changed, "
+              f"{self.stats['unchanged']} unchanged")
+
+    def close(self):
+        self.conn.close()
+
+
+class JobQueue:
+    """Make-year jobs in a SQLite file that several worker processes drain.
+
+    A worker leases a pending job. The lease expires after visibility_timeout
+    seconds unless heartbeat() renews it, and an expired lease makes the job
+    available again. complete() marks a job done. fail() puts it back with a
+    backoff delay, or marks it dead after max_attempts leases. Every state
+    change runs in a BEGIN IMMEDIATE transaction, so two workers never get
+    the same lease.
+    """
+
+    def __init__(self, queue_file: str, visibility_timeout: float = 600, max_attempts: int = 5):
+        os.makedirs(os.path.dirname(queue_file) or ".", exist_ok=True)
+        self.queue_file = queue_file
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(queue_file, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " vehicle_type TEXT NOT NULL, make TEXT NOT NULL, year TEXT NOT NULL,"
+            " years TEXT NOT NULL,"  # The make's available years, as JSON
+            " state TEXT NOT NULL DEFAULT 'pending',"  # pending, leased, done or dead
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " available_at REAL NOT NULL DEFAULT 0,"
+            " lease_owner TEXT, lease_expires REAL, last_error TEXT,"
+            " PRIMARY KEY (vehicle_type, make, year))"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, available_at)")
+
+    def _transaction(self, work):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = work()
+            self.conn.execute("COMMIT")
+            return result
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def enqueue(self, jobs: List[Tuple[str, str, List[str], str]]) -> int:
+        """Add jobs that aren't queued yet and requeue finished ones; returns how many were (re)queued.
+
+        Pending, leased and dead jobs are left as they are.
+        """
+        def work():
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT INTO jobs (vehicle_type, make, year, years) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (vehicle_type, make, year) DO UPDATE SET state = 'pending', attempts = 0,"
+                " available_at = 0, years = excluded.years, last_error = NULL WHERE state = 'done'",
+                [(vehicle_type, make, year, json.dumps(years)) for vehicle_type, make, years, year in jobs]
+            )
+            return self.conn.total_changes - before
+        return self._transaction(work)
+
+    def lease(self, owner: str, vehicle_types: List[str]) -> Optional[Tuple[str, str, List[str], str]]:
+        """Take the next available job of the given types, or None if there is none right now."""
+        def work():
+            now = time.time()
+            marks = ", ".join("?" * len(vehicle_types))
+            # Expired leases that used up their attempts are dead rather than leased again
+            self.conn.execute(
+                f"UPDATE jobs SET state = 'dead', last_error = 'lease expired', lease_owner = NULL"
+                f" WHERE state = 'leased' AND lease_expires < ? AND attempts >= ? AND vehicle_type IN ({marks})",
+                [now, self.max_attempts, *vehicle_types]
+            )
+            row = self.conn.execute(
+                f"SELECT vehicle_type, make, year, years FROM jobs"
+                f" WHERE vehicle_type IN ({marks}) AND ((state = 'pending' AND available_at <= ?)"
+                f"  OR (state = 'leased' AND lease_expires < ?))"
+                f" ORDER BY rowid LIMIT 1",
+                [*vehicle_types, now, now]
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET state = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1"
+                " WHERE vehicle_type = ? AND make = ? AND year = ?",
+                (owner, now + self.visibility_timeout) + row[:3]
+            )
+            return row[0], row[1], json.loads(row[3]), row[2]
+        return self._transaction(work)
+
+    def heartbeat(self, owner: str, keys: List[Tuple[str, str, str]]) -> List[Tuple[str, str, str]]:
+        """Extend the owner's leases on keys; returns the keys whose lease was lost."""
+        def work():
+            expires = time.time() + self.visibility_timeout
+            lost = []
+            for key in keys:
+                cursor = self.conn.execute(
+                    "UPDATE jobs SET lease_expires = ? WHERE state = 'leased' AND lease_owner = ?"
+                    " AND vehicle_type = ? AND make = ? AND year = ?",
+                    (expires, owner) + key
+                )
+                if cursor.rowcount == 0:
+                    lost.append(key)
+            return lost
+        return self._transaction(work)
+
+    def complete(self, key: Tuple[str, str, str]):
+        # A job another worker took over after our lease expired is still done once our rows are saved
+        self._transaction(lambda: self.conn.execute(
+            "UPDATE jobs SET state = 'done', lease_owner = NULL, lease_expires = NULL"
+            " WHERE state != 'done' AND vehicle_type = ? AND make = ? AND year = ?",
+            key
+        ))
+
+    def is_done(self, key: Tuple[str, str, str]) -> bool:
+        row = self.conn.execute(
+            "SELECT state FROM jobs WHERE vehicle_type = ? AND make = ? AND year = ?", key
+        ).fetchone()
+        return row is not None and row[0] == "done"
+
+    def fail(self, owner: str, key: Tuple[str, str, str], error: str):
+        """Give a failed job back, delayed by its attempt count, or dead-letter it."""
+        def work():
+            row = self.conn.execute(
+                "SELECT attempts FROM jobs WHERE state = 'leased' AND lease_owner = ?"
+                " AND vehicle_type = ? AND make = ? AND year = ?",
+                (owner,) + key
+            ).fetchone()
+            if row is None:
+                return
+            attempts = row[0]
+            state = "dead" if attempts >= self.max_attempts else "pending"
+            delay = min(CONFIG["retry"]["max_delay"], CONFIG["retry"]["base_delay"] * 2 ** attempts)
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, available_at = ?, last_error = ?, lease_owner = NULL, lease_expires = NULL"
+                " WHERE vehicle_type = ? AND make = ? AND year = ?",
+                (state, time.time() + delay, error) + key
+            )
+            print(f"Job {'/'.join(key)} {'dead-lettered' if state == 'dead' else 'returned to the queue'}"
+                  f" after {attempts} attempt(s)")
+        self._transaction(work)
+
+    def release(self, owner: str, keys: List[Tuple[str, str, str]]):
+        """Hand leases back without using up an attempt, e.g. on shutdown."""
+        def work():
+            for key in keys:
+                self.conn.execute(
+                    "UPDATE jobs SET state = 'pending', attempts = MAX(attempts - 1, 0),"
+                    " lease_owner = NULL, lease_expires = NULL"
+                    " WHERE state = 'leased' AND lease_owner = ? AND vehicle_type = ? AND make = ? AND year = ?",
+                    (owner,) + key
+                )
+        self._transaction(work)
+
+    def has_unfinished(self, vehicle_types: List[str]) -> bool:
+        """True while any job of these types is pending or leased."""
+        marks = ", ".join("?" * len(vehicle_types))
+        return self.conn.execute(
+            f"SELECT 1 FROM jobs WHERE state IN ('pending', 'leased') AND vehicle_type IN ({marks}) LIMIT 1",
+            vehicle_types
+        ).fetchone() is not None
+
+    def requeue_dead(self) -> int:
+        return self._transaction(lambda: self.conn.execute(
+            "UPDATE jobs SET state = 'pending', attempts = 0, available_at = 0 WHERE state = 'dead'"
+        ).rowcount)
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"))
+
+    def report(self):
+        counts = self.counts()
+        print(f"Job queue {self.queue_file}: " +
+              ", ".join(f"{counts.get(state, 0)} {state}" for state in ("pending", "leased", "done", "dead")))
+        for vehicle_type, make, year, error in self.conn.execute(
+                "SELECT vehicle_type, make, year, last_error FROM jobs WHERE state = 'dead' LIMIT 20"):
+            print(f"  dead: {vehicle_type}/{make}/{year}: {error}")
+
+    def close(self):
+        self.conn.close()
+
+
+class RowIndex:
+    """Persistent per-sheet set of row hashes, checked before every append.
+
+    Hashes live in ``<index_dir>/<Sheet>.hashes`` (one per line, appended
+    after each save) next to ``meta.json``, which records how many data rows
+    each sheet had when its hashes were last written. If the counts no
+    longer match the workbook, for example after it was edited by hand, that
+    sheet's index is rebuilt from the workbook once at startup.
+    """
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        os.makedirs(index_dir, exist_ok=True)
+        self.meta_path = os.path.join(index_dir, "meta.json")
+        self.meta = {}
+        if os.path.exists(self.meta_path):
+            try:
+                with open(self.meta_path, 'r') as f:
+                    self.meta = json.load(f)
+            except Exception as e:
+                print(f"Error loading row index metadata: {e}. Rebuilding.")
+        self.hashes = {}
+        self.headers = {}
+        self.unsaved = {}
+
+    @staticmethod
+    def normalize(row) -> List[str]:
+        values = ["" if value is None else str(value).strip() for value in row]
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    @staticmethod
+    def row_hash(values: List[str]) -> str:
+        return hashlib.blake2b("\x1f".join(values).encode("utf-8"), digest_size=16).hexdigest()
+
+    def _path(self, sheet_name: str) -> str:
+        return os.path.join(self.index_dir, f"{sheet_name}.hashes")
+
+    def load_sheet(self, sheet_name: str, sheet, headers: List[str]):
+        self.headers[sheet_name] = self.normalize(headers)
+        self.unsaved[sheet_name] = []
+        data_rows = max(sheet.max_row - 1, 0)
+        path = self._path(sheet_name)
+        if self.meta.get(sheet_name) == data_rows and os.path.exists(path):
+            with open(path, 'r') as f:
+                self.hashes[sheet_name] = set(line.strip() for line in f if line.strip())
+            return
+
+        print(f"Building row index for sheet {sheet_name}...")
+        hashes = set()
+        for row in sheet.iter_rows(min_row=2, values_only=True):
+            hashes.add(self.row_hash(self.normalize(row)))
+        self.hashes[sheet_name] = hashes
+        with open(path, 'w') as f:
+            f.writelines(f"{row_hash}\n" for row_hash in hashes)
+        self.meta[sheet_name] = data_rows
+        self._write_meta()
+
+    @staticmethod
+    def matches_header(values: List[str], headers: List[str]) -> bool:
+        # Repeated header rows, including ones only matching from the Model column on
+        return values == headers[:len(values)] or (len(values) > 3 and values[3:] == headers[3:len(values)])
+
+    def is_header(self, sheet_name: str, values: List[str]) -> bool:
+        return self.matches_header(values, self.headers[sheet_name])
+
+    def add(self, sheet_name: str, row: List) -> bool:
+        """Register a row, returning False if it is a duplicate or a header."""
+        values = self.normalize(row)
+        if not values or self.is_header(sheet_name, values):
+            return False
+        row_hash = self.row_hash(values)
+        if row_hash in self.hashes[sheet_name]:
+            return False
+        self.hashes[sheet_name].add(row_hash)
+        self.unsaved[sheet_name].append(row_hash)
+        return True
+
+    def persist(self, data_rows: Dict[str, int]):
+        """Append hashes of rows that are now saved and record the sheet sizes."""
+        for sheet_name, hashes in self.unsaved.items():
+            if hashes:
+                with open(self._path(sheet_name), 'a') as f:
+                    f.writelines(f"{row_hash}\n" for row_hash in hashes)
+                self.unsaved[sheet_name] = []
+        self.meta.update(data_rows)
+        self._write_meta()
+
+    def _write_meta(self):
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+
+class XlsxStorage:
+    """Keeps the scraped rows directly in the output workbook."""
+
     def __init__(self, output_path: str):
         self.output_path = output_path
         self.workbook = self._initialize_workbook()
         self.sheets = {}
+        self.row_index = RowIndex(os.path.splitext(output_path)[0] + "_index")
 
     def _initialize_workbook(self) -> Workbook:
         if os.path.exists(self.output_path):
@@ -148,39 +655,6 @@ class ExcelManager:
             del wb['Sheet']
         return wb
 
-    def clean_duplicates(self):
-        """Remove duplicate rows across all sheets and ensure no default sheet"""
-        # Remove default sheet if exists
-        if 'Sheet' in self.workbook.sheetnames:
-            del self.workbook['Sheet']
-        
-        for sheet_name in self.workbook.sheetnames:
-            sheet = self.workbook[sheet_name]
-            rows = list(sheet.iter_rows(values_only=True))
-            if not rows:
-                continue  # Skip empty sheets
-            
-            headers = rows[0]
-            seen = set()
-            unique_rows = []
-            
-            for row in rows[1:]:  # Skip header
-                row_tuple = tuple(row)
-                if row_tuple not in seen:
-                    seen.add(row_tuple)
-                    unique_rows.append(row)
-            
-            # Clear existing data
-            sheet.delete_rows(1, sheet.max_row)
-            # Rewrite headers and unique rows
-            sheet.append(headers)
-            for row in unique_rows:
-                sheet.append(row)
-        
-        self.save()
-        print("Successfully cleaned duplicates and removed default sheet.")
-
-
     def get_sheet(self, vehicle_type: str):
         if vehicle_type not in self.sheets:
             sheet_name = vehicle_type.capitalize()
@@ -189,36 +663,854 @@ class ExcelManager:
             else:
                 sheet = self.workbook.create_sheet(title=sheet_name)
                 sheet.append(CONFIG["headers"][vehicle_type])
+            self.row_index.load_sheet(sheet_name, sheet, CONFIG["headers"][vehicle_type])
             self.sheets[vehicle_type] = sheet
         return self.sheets[vehicle_type]
 
-    def save(self):
+    def add(self, vehicle_type: str, row: List) -> bool:
+        return self.row_index.add(self.get_sheet(vehicle_type).title, row)
+
+    def write(self, rows_by_type: Dict[str, List[List]]):
+        for vehicle_type, rows in rows_by_type.items():
+            sheet = self.get_sheet(vehicle_type)
+            for row in rows:
+                sheet.append(row)
         self.workbook.save(self.output_path)
+        self.row_index.persist({
+            sheet.title: sheet.max_row - 1 for sheet in self.sheets.values()
+        })
+
+    def export(self):
+        pass  # The workbook is already the deliverable
+
+    def close(self):
+        pass
+
+
+class SqliteStorage:
+    """Primary store with one typed table per vehicle type in SQLite.
+
+    Columns come from CONFIG["headers"] (Year is an INTEGER, the rest TEXT),
+    each row carries a unique hash so duplicates are rejected by an index,
+    and appends are plain inserts. Nothing is held in memory beyond the
+    pending batch; the xlsx deliverable is produced by ``export``.
+    """
+
+    def __init__(self, database_path: str, output_path: str):
+        self.database_path = database_path
+        self.output_path = output_path
+        is_new = not os.path.exists(database_path)
+        self.conn = sqlite3.connect(database_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.tables = set()
+        self.pending_hashes = {}
+        self.headers = {vehicle_type: RowIndex.normalize(headers)
+                        for vehicle_type, headers in CONFIG["headers"].items()}
+        if is_new and os.path.exists(output_path):
+            self._import_workbook()
+
+    @staticmethod
+    def _columns(vehicle_type: str) -> List[str]:
+        return CONFIG["headers"][vehicle_type]
+
+    def _ensure_table(self, vehicle_type: str):
+        if vehicle_type in self.tables:
+            return
+        columns = ", ".join(
+            f'"{name}" {"INTEGER" if name == "Year" else "TEXT"}' for name in self._columns(vehicle_type)
+        )
+        self.conn.execute(f'CREATE TABLE IF NOT EXISTS "{vehicle_type}" ({columns}, row_hash TEXT NOT NULL UNIQUE)')
+        self.conn.execute(f'CREATE INDEX IF NOT EXISTS "{vehicle_type}_year_make" ON "{vehicle_type}" ("Year", "Make")')
+        self.conn.commit()
+        self.tables.add(vehicle_type)
+        self.pending_hashes.setdefault(vehicle_type, set())
+
+    def _import_workbook(self):
+        """Seed a new database from the existing workbook, streaming it row by row."""
+        print(f"Importing {self.output_path} into {self.database_path}...")
+        workbook = load_workbook(self.output_path, read_only=True)
+        sheet_types = {vehicle_type.capitalize(): vehicle_type for vehicle_type in CONFIG["headers"]}
+        for sheet_name in workbook.sheetnames:
+            vehicle_type = sheet_types.get(sheet_name)
+            if vehicle_type is None:
+                continue
+            self._ensure_table(vehicle_type)
+            batch = []
+            for row in workbook[sheet_name].iter_rows(min_row=2, values_only=True):
+                if RowIndex.matches_header(RowIndex.normalize(row), self.headers[vehicle_type]):
+                    continue
+                batch.append(row)
+                if len(batch) >= 5000:
+                    self._insert(vehicle_type, batch)
+                    batch = []
+            self._insert(vehicle_type, batch)
+        self.conn.commit()
+        workbook.close()
+
+    def _insert(self, vehicle_type: str, rows: List) -> int:
+        columns = self._columns(vehicle_type)
+        placeholders = ", ".join("?" for _ in range(len(columns) + 1))
+        records = []
+        for row in rows:
+            values = list(row[:len(columns)]) + [None] * (len(columns) - len(row))
+            records.append(values + [RowIndex.row_hash(RowIndex.normalize(row))])
+        cursor = self.conn.executemany(
+            f'INSERT OR IGNORE INTO "{vehicle_type}" VALUES ({placeholders})', records
+        )
+        return cursor.rowcount
+
+    def get_sheet(self, vehicle_type: str):
+        self._ensure_table(vehicle_type)
+
+    def add(self, vehicle_type: str, row: List) -> bool:
+        self._ensure_table(vehicle_type)
+        values = RowIndex.normalize(row)
+        if not values or RowIndex.matches_header(values, self.headers[vehicle_type]):
+            return False
+        row_hash = RowIndex.row_hash(values)
+        pending = self.pending_hashes[vehicle_type]
+        if row_hash in pending:
+            return False
+        exists = self.conn.execute(
+            f'SELECT 1 FROM "{vehicle_type}" WHERE row_hash = ?', (row_hash,)
+        ).fetchone()
+        if exists:
+            return False
+        pending.add(row_hash)
+        return True
+
+    def write(self, rows_by_type: Dict[str, List[List]]):
+        for vehicle_type, rows in rows_by_type.items():
+            self._ensure_table(vehicle_type)
+            self._insert(vehicle_type, rows)
+        self.conn.commit()
+        for pending in self.pending_hashes.values():
+            pending.clear()
+
+    def iter_rows(self, vehicle_type: str):
+        """Stream a vehicle type's rows in insertion order."""
+        columns = ", ".join(f'"{name}"' for name in self._columns(vehicle_type))
+        yield from self.conn.execute(f'SELECT {columns} FROM "{vehicle_type}" ORDER BY rowid')
+
+    def export(self):
+        """Write the xlsx deliverable with openpyxl's streaming write-only mode."""
+        existing = {name for (name,) in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        workbook = Workbook(write_only=True)
+        for vehicle_type in CONFIG["headers"]:
+            if vehicle_type not in existing:
+                continue
+            sheet = workbook.create_sheet(title=vehicle_type.capitalize())
+            sheet.append(self._columns(vehicle_type))
+            for row in self.iter_rows(vehicle_type):
+                sheet.append([str(value) if isinstance(value, int) else value for value in row])
+        # Per process, so workers sharing a folder never write the same temporary file
+        tmp_path = f"{self.output_path}.{os.getpid()}.tmp.xlsx"
+        workbook.save(tmp_path)
+        os.replace(tmp_path, self.output_path)
+        print(f"Exported {self.database_path} to {self.output_path}")
+
+    def merge(self, database_path: str) -> Dict[str, int]:
+        """Copy in the rows of another worker's database; returns how many were new per vehicle type."""
+        self.conn.execute("ATTACH DATABASE ? AS other", (database_path,))
+        try:
+            tables = {name for (name,) in self.conn.execute(
+                "SELECT name FROM other.sqlite_master WHERE type = 'table'")}
+            added = {}
+            for vehicle_type in CONFIG["headers"]:
+                if vehicle_type not in tables:
+                    continue
+                self._ensure_table(vehicle_type)
+                columns = ", ".join(f'"{name}"' for name in self._columns(vehicle_type) + ["row_hash"])
+                cursor = self.conn.execute(
+                    f'INSERT OR IGNORE INTO main."{vehicle_type}" ({columns})'
+                    f' SELECT {columns} FROM other."{vehicle_type}" ORDER BY rowid'
+                )
+                added[vehicle_type] = cursor.rowcount
+            self.conn.commit()
+        finally:
+            self.conn.execute("DETACH DATABASE other")
+        return added
+
+    def close(self):
+        self.conn.close()
+
+
+class ExcelManager:
+    """Write-behind front end over the storage backend.
+
+    Rows are buffered per sheet and written out in one batch once
+    ``flush_rows`` rows are pending or ``flush_interval`` seconds have passed,
+    instead of rewriting the store after every row. ``storage`` is an
+    XlsxStorage or SqliteStorage.
+    """
+
+    def __init__(self, storage, flush_rows: int = 500, flush_interval: float = 30.0):
+        self.storage = storage
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.pending_rows = {}
+        self.pending_count = 0
+        self.pending_callbacks = []
+        self.observers = []
+        self.last_flush_time = time.time()
+
+    def get_sheet(self, vehicle_type: str):
+        return self.storage.get_sheet(vehicle_type)
+
+    def add_observer(self, callback):
+        """Call ``callback(vehicle_type, row)`` for every appended row, duplicates included."""
+        self.observers.append(callback)
+
+    def append(self, vehicle_type: str, row: List):
+        """Queue a row for the vehicle type's sheet unless it is already there."""
+        for observer in self.observers:
+            observer(vehicle_type, row)
+        if not self.storage.add(vehicle_type, row):
+            return
+        self.pending_rows.setdefault(vehicle_type, []).append(row)
+        self.pending_count += 1
+        self.maybe_flush()
+
+    def when_flushed(self, callback):
+        """Run ``callback`` once every row queued so far is saved to disk."""
+        if self.pending_count == 0:
+            callback()
+        else:
+            self.pending_callbacks.append(callback)
+            self.maybe_flush()
+
+    def maybe_flush(self):
+        if (self.pending_count >= self.flush_rows
+                or time.time() - self.last_flush_time >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        if self.pending_count:
+            self.storage.write(self.pending_rows)
+            print(f"Flushed {self.pending_count} row(s)")
+            self.pending_rows = {}
+            self.pending_count = 0
+        self.last_flush_time = time.time()
+        # Only now are the rows behind these callbacks durable
+        callbacks, self.pending_callbacks = self.pending_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    @staticmethod
+    def install_signal_handlers():
+        """Treat SIGTERM/SIGHUP like Ctrl+C so the shutdown path flushes buffered rows."""
+        def handle_signal(signum, frame):
+            print(f"\nSignal {signum} received. Shutting down...")
+            raise KeyboardInterrupt
+
+        for name in ("SIGTERM", "SIGHUP"):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), handle_signal)
+
+    def export(self):
+        self.flush()
+        self.storage.export()
+
+    def close(self):
+        self.storage.close()
+
+
+def open_storage(kind: str):
+    if kind == "sqlite":
+        return SqliteStorage(CONFIG["database_file"], CONFIG["output_file"])
+    return XlsxStorage(CONFIG["output_file"])
+
+
+class ResourceFilter:
+    """Playwright route handler enforcing CONFIG["resource_filter"]."""
+
+    def __init__(self, policy: Dict):
+        self.policy = policy
+        self.stats = {'allowed': 0, 'blocked': 0, 'stubbed': 0, 'bytes_saved': 0, 'blocked_by_type': {}}
+
+    def decide(self, url: str, resource_type: str) -> str:
+        if any(pattern in url for pattern in self.policy["allow_patterns"]):
+            return "allow"
+        if (resource_type in self.policy["block_types"]
+                or any(pattern in url for pattern in self.policy["deny_patterns"])):
+            return "stub" if resource_type in self.policy["stub_types"] else "block"
+        return "allow"
+
+    async def handle(self, route):
+        request = route.request
+        decision = self.decide(request.url, request.resource_type)
+        if decision == "allow":
+            self.stats['allowed'] += 1
+            await route.continue_()
+            return
+
+        by_type = self.stats['blocked_by_type']
+        by_type[request.resource_type] = by_type.get(request.resource_type, 0) + 1
+        estimates = self.policy["estimated_bytes"]
+        self.stats['bytes_saved'] += estimates.get(request.resource_type, estimates["other"])
+        if decision == "stub":
+            self.stats['stubbed'] += 1
+            await route.fulfill(status=200, body="")
+        else:
+            self.stats['blocked'] += 1
+            await route.abort("blockedbyclient")
+
+    def report(self):
+        by_type = ", ".join(f"{name}: {count}" for name, count in sorted(self.stats['blocked_by_type'].items()))
+        print(
+            f"Resource filter: {self.stats['allowed']} allowed, {self.stats['blocked']} blocked, "
+            f"{self.stats['stubbed']} stubbed ({by_type or 'none'}), "
+            f"~{self.stats['bytes_saved'] / 1024 / 1024:.1f} MiB saved"
+        )
+
 
 class BrowserManager:
-    def __init__(self):
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.firefox.launch(headless=True)
-        self.context = self.browser.new_context(ignore_https_errors=True)
-        self.page = self.context.new_page()
-        stealth_sync(self.page)
+    """Pool of warm Firefox contexts shared by all scrapers.
+
+    One browser is launched per run and each context hands out a single
+    stealth page. A context is recycled after ``max_navigations`` page loads
+    or when its page crashes, so a long run only pays for a handful of
+    browser launches instead of one per make-year.
+    """
 
-    def __enter__(self):
-        return self.page
+    def __init__(self, pool_size: int = 1, max_navigations: int = 50,
+                 resource_filter: Optional[ResourceFilter] = None):
+        self.pool_size = pool_size
+        self.max_navigations = max_navigations
+        self.resource_filter = resource_filter
+        self.playwright = None
+        self.browser = None
+        self.idle = asyncio.Queue()
+        self.stats = {
+            'browser_launches': 0,
+            'contexts_created': 0,
+            'contexts_recycled': 0,
+            'acquisitions': 0,
+            'acquire_wait_total': 0.0,
+            'acquire_wait_max': 0.0,
+        }
+        self._launch_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        self.playwright = await async_playwright().start()
+        for _ in range(self.pool_size):
+            self.idle.put_nowait(await self._new_slot())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _launch_browser(self):
+        async with self._launch_lock:
+            if self.browser is not None and self.browser.is_connected():
+                return
+            self.browser = await self.playwright.firefox.launch(headless=True)
+            self.stats['browser_launches'] += 1
+
+    async def _new_slot(self) -> Dict:
+        await self._launch_browser()
+        context = await self.browser.new_context(ignore_https_errors=True)
+        if self.resource_filter is not None:
+            await context.route("**/*", self.resource_filter.handle)
+        slot = {'context': context, 'page': None, 'navigations': 0, 'crashed': False}
+        context.on("page", lambda page: self._watch_page(slot, page))
+        slot['page'] = await context.new_page()
+        await stealth_async(slot['page'])
+        self.stats['contexts_created'] += 1
+        return slot
+
+    def _watch_page(self, slot: Dict, page: Page):
+        def on_navigation(frame):
+            if frame.parent_frame is None:
+                slot['navigations'] += 1
+
+        def on_crash(_):
+            slot['crashed'] = True
+
+        page.on("framenavigated", on_navigation)
+        page.on("crash", on_crash)
+
+    @staticmethod
+    def _placeholder() -> Dict:
+        """Stand-in for a slot whose context could not be rebuilt; the next checkout retries."""
+        return {'context': None, 'page': None, 'navigations': 0, 'crashed': True}
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.context.close()
-        self.browser.close()
-        self.playwright.stop()
+    async def _recycle(self, slot: Dict) -> Dict:
+        try:
+            if slot['context'] is not None:
+                await slot['context'].close()
+        except Exception:
+            pass  # Context already gone with a crashed browser
+        self.stats['contexts_recycled'] += 1
+        return await self._new_slot()
+
+    async def _reset(self, slot: Dict) -> Dict:
+        """Close extra tabs and decide whether the slot can be reused."""
+        if slot['crashed'] or slot['navigations'] >= self.max_navigations:
+            return await self._recycle(slot)
+        try:
+            for page in slot['context'].pages:
+                if page is not slot['page']:
+                    await page.close()
+            if slot['page'].is_closed():
+                # Scrapers close the page when they bail out early
+                slot['page'] = await slot['context'].new_page()
+                await stealth_async(slot['page'])
+        except Exception:
+            return await self._recycle(slot)
+        return slot
+
+    @asynccontextmanager
+    async def page(self):
+        """Check out a warm page, returning it to the pool afterwards."""
+        start = time.perf_counter()
+        slot = await self.idle.get()
+        waited = time.perf_counter() - start
+        self.stats['acquisitions'] += 1
+        self.stats['acquire_wait_total'] += waited
+        self.stats['acquire_wait_max'] = max(self.stats['acquire_wait_max'], waited)
+        if slot['context'] is None:
+            try:
+                slot = await self._new_slot()
+            except BaseException:
+                self.idle.put_nowait(self._placeholder())
+                raise
+        try:
+            yield slot['page']
+        except Exception:
+            # The page may be half-navigated or wedged; start over with a clean context
+            slot['crashed'] = True
+            raise
+        finally:
+            # Whatever happens, the slot goes back so the pool never shrinks
+            replacement = self._placeholder()
+            try:
+                replacement = await self._reset(slot)
+            except Exception as e:
+                print(f"Could not recycle a browser context, rebuilding it on next use: {e}")
+            finally:
+                self.idle.put_nowait(replacement)
+
+    def report(self):
+        acquisitions = self.stats['acquisitions'] or 1
+        print(
+            f"Browser pool: {self.stats['browser_launches']} launch(es), "
+            f"{self.stats['contexts_created']} context(s) created, "
+            f"{self.stats['contexts_recycled']} recycled, "
+            f"{self.stats['acquisitions']} page acquisition(s), "
+            f"avg wait {self.stats['acquire_wait_total'] / acquisitions:.3f}s, "
+            f"max wait {self.stats['acquire_wait_max']:.3f}s"
+        )
+        if self.resource_filter is not None:
+            self.resource_filter.report()
+
+    async def close(self):
+        while not self.idle.empty():
+            slot = self.idle.get_nowait()
+            if slot['context'] is None:
+                continue
+            try:
+                await slot['context'].close()
+            except Exception:
+                pass
+        if self.browser is not None:
+            await self.browser.close()
+        if self.playwright is not None:
+            await self.playwright.stop()
+
+
+class HttpPage:
+    """Browserless stand-in for a Playwright page over server-rendered HTML."""
+
+    def __init__(self, backend: "HttpBackend"):
+        self.backend = backend
+        self.url = None
+        self.soup = None
+
+    async def goto(self, url: str):
+        start = time.perf_counter()
+        response = await self.backend.client.get(url)
+        response.raise_for_status()
+        self.backend.record(len(response.content), time.perf_counter() - start)
+        self.url = str(response.url)
+        self.soup = BeautifulSoup(response.text, "html.parser")
+
+    async def close(self):
+        pass
+
+    def has_invalid_header(self) -> bool:
+        return any("undefined undefined" in header.get_text(" ").lower()
+                   for header in self.soup.select(INVALID_HEADERS))
+
+    def next_data(self) -> Optional[Dict]:
+        script = self.soup.find("script", id="__NEXT_DATA__")
+        if script is None or not script.string:
+            return None
+        try:
+            return json.loads(script.string)
+        except ValueError:
+            return None
+
+    def _read(self, el, attr: Optional[str]):
+        if not attr or attr == "text":
+            return " ".join(el.get_text(" ").split())
+        if attr == "href":
+            href = el.get("href")
+            return urljoin(self.url, href) if href else None
+        value = el.get(attr)
+        return " ".join(value) if isinstance(value, list) else value
+
+    def _eval_fields(self, root, fields: Dict) -> Dict:
+        return {name: self._eval_field(root, field) for name, field in fields.items()}
+
+    def _eval_field(self, root, field: Dict):
+        base = root
+        if field.get("closest"):
+            base = soupsieve.closest(field["closest"], root) if root is not self.soup else None
+        selector = field.get("selector")
+
+        def pick(el):
+            return self._eval_fields(el, field["fields"]) if field.get("fields") else self._read(el, field.get("attr"))
+
+        if field.get("all"):
+            if base is None:
+                return []
+            return [pick(el) for el in (base.select(selector) if selector else [base])]
+        el = base.select_one(selector) if base is not None and selector else base
+        return pick(el) if el is not None and el is not self.soup else None
+
+    def extract(self, spec: Dict) -> Dict:
+        """Python twin of BULK_EXTRACT_JS for the same extraction specs."""
+        result = self._eval_fields(self.soup, spec.get("fields", {}))
+        if spec.get("invalid_headers"):
+            result["invalid"] = any(
+                "undefined undefined" in header.get_text(" ").lower()
+                for header in self.soup.select(spec["invalid_headers"])
+            )
+        return result
+
+
+class HttpBackend:
+    """Pooled keep-alive HTTP client that hands out browserless pages.
+
+    Used for vehicle types whose data is in the initial HTML, so they can
+    run far more concurrent jobs than a browser pool allows.
+    """
+
+    def __init__(self, max_connections: int = 20, timeout: float = 30, headers: Dict = None):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.client = None
+        self.stats = {'requests': 0, 'bytes': 0, 'fetch_time_total': 0.0}
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @asynccontextmanager
+    async def page(self):
+        yield HttpPage(self)
+
+    def record(self, size: int, elapsed: float):
+        self.stats['requests'] += 1
+        self.stats['bytes'] += size
+        self.stats['fetch_time_total'] += elapsed
+
+    def report(self):
+        requests = self.stats['requests'] or 1
+        print(
+            f"HTTP backend: {self.stats['requests']} request(s), "
+            f"{self.stats['bytes'] / 1024:.0f} KiB, "
+            f"avg fetch {self.stats['fetch_time_total'] / requests:.3f}s"
+        )
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+
+
+# Evaluates a declarative extraction spec inside the page so a whole page is
+# read in one round trip. A spec maps output names to field specs; a field
+# spec can walk up with "closest", then pick "selector" (the first match, or
+# every match with "all") and read "attr" ("text" by default) or a nested
+# "fields" record from each match. "invalid_headers" flags JD Power's
+# "undefined undefined" placeholder pages.
+BULK_EXTRACT_JS = """
+(spec) => {
+    const read = (el, attr) => {
+        if (!attr || attr === 'text') return (el.innerText || '').trim();
+        if (attr === 'href') return el.href || el.getAttribute('href');
+        return el.getAttribute(attr);
+    };
+    const evalFields = (root, fields) => {
+        const out = {};
+        for (const [name, field] of Object.entries(fields)) out[name] = evalField(root, field);
+        return out;
+    };
+    const evalField = (root, field) => {
+        let base = root;
+        if (field.closest) base = root.closest ? root.closest(field.closest) : null;
+        const pick = (el) => field.fields ? evalFields(el, field.fields) : read(el, field.attr);
+        if (field.all) {
+            if (!base) return [];
+            return Array.from(field.selector ? base.querySelectorAll(field.selector) : [base]).map(pick);
+        }
+        const el = base && field.selector ? base.querySelector(field.selector) : base;
+        return el && el !== document ? pick(el) : null;
+    };
+    const result = evalFields(document, spec.fields || {});
+    if (spec.invalid_headers) {
+        result.invalid = Array.from(document.querySelectorAll(spec.invalid_headers))
+            .some((h) => (h.innerText || '').toLowerCase().includes('undefined undefined'));
+    }
+    return result;
+}
+"""
+
+INVALID_HEADERS = "h1, h2, h3"
+
+
+class PageReadiness:
+    """Waits on CONFIG["readiness"] conditions and records how long each wait took.
+
+    The per-condition timings are written to ``stats_file`` at the end of a
+    run so the timeouts can be tuned from real data.
+    """
+
+    def __init__(self, conditions: Dict, stats_file: str):
+        self.conditions = conditions
+        self.stats_file = stats_file
+        self.samples = {}
+
+    async def goto(self, page: Page, url: str, vehicle_type: str, kind: str = "year"):
+        condition = self.conditions[vehicle_type][kind]
+        await page.goto(url, wait_until=condition.get("wait_until", "domcontentloaded"),
+                        timeout=condition.get("goto_timeout", 60000))
+        await self.wait(page, vehicle_type, kind)
+
+    async def wait(self, page: Page, vehicle_type: str, kind: str = "year"):
+        condition = self.conditions[vehicle_type][kind]
+        start = time.perf_counter()
+        outcome = "ready"
+        try:
+            await page.wait_for_selector(ready_or_invalid(condition["selector"]),
+                                         timeout=condition["timeout"])
+        except PlaywrightTimeoutError:
+            if not condition.get("fallback"):
+                self._record(vehicle_type, kind, "timeout", time.perf_counter() - start)
+                raise
+            outcome = "fallback"
+            await page.wait_for_load_state(condition["fallback"],
+                                           timeout=condition.get("fallback_timeout", 10000))
+        self._record(vehicle_type, kind, outcome, time.perf_counter() - start)
+
+    def check(self, page: "HttpPage", vehicle_type: str, kind: str = "year"):
+        """wait() for a fetched HttpPage: the HTML must already hold the selector or an invalid header.
+
+        Challenge and error pages are served with a 200 too, so anything else
+        raises the same timeout a browser wait would.
+        """
+        condition = self.conditions[vehicle_type][kind]
+        if page.soup.select_one(condition["selector"]) is not None or page.has_invalid_header():
+            return
+        if not condition.get("fallback"):
+            raise PlaywrightTimeoutError(f"{condition['selector']} not found in {page.url}")
+
+    def _record(self, vehicle_type: str, kind: str, outcome: str, elapsed: float):
+        key = f"{vehicle_type}/{kind}"
+        self.samples.setdefault(key, {}).setdefault(outcome, []).append(elapsed)
+
+    def summary(self) -> Dict:
+        summary = {}
+        for key, outcomes in self.samples.items():
+            summary[key] = {}
+            for outcome, samples in outcomes.items():
+                ordered = sorted(samples)
+                summary[key][outcome] = {
+                    "count": len(ordered),
+                    "mean": sum(ordered) / len(ordered),
+                    "p50": ordered[len(ordered) // 2],
+                    "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                    "max": ordered[-1],
+                }
+        return summary
+
+    def report(self):
+        summary = self.summary()
+        for key, outcomes in summary.items():
+            for outcome, stats in outcomes.items():
+                print(f"Readiness {key} [{outcome}]: {stats['count']} wait(s), "
+                      f"mean {stats['mean']:.2f}s, p95 {stats['p95']:.2f}s, max {stats['max']:.2f}s")
+        with open(self.stats_file, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+NEXT_DATA_JS = """
+() => {
+    const el = document.getElementById('__NEXT_DATA__');
+    if (!el) return null;
+    try { return JSON.parse(el.textContent); } catch (e) { return null; }
+}
+"""
+
+
+class PayloadCapture:
+    """Collects the JSON a page was rendered from.
+
+    While attached it keeps the bodies of JSON responses whose URL matches
+    one of ``url_patterns``; ``collect`` adds the page's ``__NEXT_DATA__``.
+    """
+
+    def __init__(self, page: Page, url_patterns: List[str]):
+        self.page = page
+        self.url_patterns = url_patterns
+        self.payloads = []
+
+    async def __aenter__(self):
+        self.page.on("response", self._on_response)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.page.remove_listener("response", self._on_response)
+
+    async def _on_response(self, response):
+        if "json" not in response.headers.get("content-type", ""):
+            return
+        if not any(pattern in response.url for pattern in self.url_patterns):
+            return
+        try:
+            self.payloads.append(await response.json())
+        except Exception:
+            pass  # Body gone with a navigation or not valid JSON
+
+    async def collect(self) -> List:
+        next_data = await self.page.evaluate(NEXT_DATA_JS)
+        return ([next_data] if next_data else []) + self.payloads
+
+
+def payload_records(payloads: List, fields: Dict[str, List[str]], required: List[str]) -> List[Dict[str, str]]:
+    """Find every object in the payloads that carries the ``required`` fields.
+
+    ``fields`` maps an output name to the JSON keys it may appear under
+    (matched case-insensitively). A record only takes values from a single
+    object, never from the objects enclosing it, so a page's navigation or
+    breadcrumbs can't fill in a field that the model object lacks.
+    """
+    records = []
+    seen = set()
+
+    def visit(node):
+        if isinstance(node, list):
+            for item in node:
+                visit(item)
+            return
+        if not isinstance(node, dict):
+            return
+        lowered = {str(key).lower(): value for key, value in node.items()}
+        record = {}
+        for name, aliases in fields.items():
+            for alias in aliases:
+                value = lowered.get(alias.lower())
+                if isinstance(value, (str, int, float)) and not isinstance(value, bool) and str(value).strip():
+                    record[name] = str(value).strip()
+                    break
+        if all(name in record for name in required):
+            key = tuple(sorted(record.items()))
+            if key not in seen:
+                seen.add(key)
+                records.append(record)
+        for value in node.values():
+            visit(value)
+
+    for payload in payloads:
+        visit(payload)
+    return records
+
+
+def ready_or_invalid(selector: str) -> str:
+    """Selector matching either the content we want or an 'undefined undefined' header."""
+    invalid = ", ".join(f"{tag.strip()}:has-text('undefined undefined')" for tag in INVALID_HEADERS.split(","))
+    return f"{selector}, {invalid}"
+
+
+async def extract(page, spec: Dict) -> Dict:
+    if isinstance(page, HttpPage):
+        return page.extract(spec)
+    return await page.evaluate(BULK_EXTRACT_JS, spec)
 
 
 class BaseScraper:
-    def __init__(self, excel_manager: ExcelManager, vehicle_type: str):
+    # Declarative spec describing what to read from a make-year page
+    EXTRACTION_SPEC: Dict = {}
+    # Per page kind, the payload_records() fields used in "json" extraction mode
+    PAYLOAD_FIELDS: Dict = {}
+
+    def __init__(self, excel_manager: ExcelManager, backend, readiness: PageReadiness, vehicle_type: str):
         self.excel = excel_manager
+        self.backend = backend  # BrowserManager or HttpBackend
+        self.readiness = readiness
         self.vehicle_type = vehicle_type
-        self.sheet = self.excel.get_sheet(vehicle_type)
+        self.extraction_mode = CONFIG["extraction_mode"][vehicle_type]
+        self.payload_stats = {"hits": 0, "misses": 0}
+        self.excel.get_sheet(vehicle_type)  # Create the sheet with headers up front
+
+    async def _open(self, page: Page, url: str = None, kind: str = "year") -> List[Dict]:
+        """Load a page (or settle an already opened tab when ``url`` is None).
 
-    def process_make(self, make: str, years: List[str], selected_years: List[str]):
+        In "json" mode the payload records are returned as soon as the
+        document has loaded. An empty list means the caller should read the
+        page through its selectors, which are ready by the time we return.
+        """
+        if isinstance(page, HttpPage):
+            # Server-rendered HTML is complete once fetched; only __NEXT_DATA__ is available
+            if url is not None:
+                await page.goto(url)
+            if self.extraction_mode == "json" and kind in self.PAYLOAD_FIELDS:
+                next_data = page.next_data()
+                records = payload_records([next_data] if next_data else [], **self.PAYLOAD_FIELDS[kind])
+                self.payload_stats["hits" if records else "misses"] += 1
+                if records:
+                    return records
+            self.readiness.check(page, self.vehicle_type, kind)
+            return []
+        if self.extraction_mode == "json" and kind in self.PAYLOAD_FIELDS:
+            async with PayloadCapture(page, CONFIG["payload_url_patterns"]) as capture:
+                if url is not None:
+                    await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+                else:
+                    await page.wait_for_load_state("domcontentloaded")
+                records = payload_records(await capture.collect(), **self.PAYLOAD_FIELDS[kind])
+            if records:
+                self.payload_stats["hits"] += 1
+                return records
+            self.payload_stats["misses"] += 1
+            print(f"No {kind} payload found for {page.url}, falling back to selectors")
+            await self.readiness.wait(page, self.vehicle_type, kind)
+        elif url is not None:
+            await self.readiness.goto(page, url, self.vehicle_type, kind)
+        else:
+            await self.readiness.wait(page, self.vehicle_type, kind)
+        return []
+
+    async def process_make(self, make: str, years: List[str], selected_years: List[str]):
+        for year in selected_years:
+            if year not in years:
+                continue
+            async with self.backend.page() as page:
+                await self._process_year(make, year, page)
+
+    async def _process_year(self, make: str, year: str, page: Page):
         raise NotImplementedError
 
     @staticmethod
@@ -232,121 +1524,167 @@ class BaseScraper:
         return makes
 
 class CarScraper(BaseScraper):
-    def process_make(self, make: str, years: List[str], selected_years: List[str]):
-        for year in selected_years:
-            if year not in years:
-                continue
-            with BrowserManager() as page:
-                self._process_year(make, year, page)
+    EXTRACTION_SPEC = {
+        "fields": {
+            "models": {
+                "selector": ".yearMake_model-wrapper-h3__npC2B h3",
+                "all": True,
+                "fields": {
+                    "name": {},
+                    "url": {"closest": ".yearMake_model-wrapper__t8GAv", "selector": "a", "attr": "href"},
+                },
+            },
+        },
+    }
+    MODEL_SPEC = {
+        "invalid_headers": INVALID_HEADERS,
+        "fields": {
+            "trim_containers": {
+                "selector": ".MuiGrid-root.MuiGrid-item.MuiGrid-grid-xs-12.MuiGrid-grid-md-6.trimSelection_card-info__O02As",
+                "all": True,
+                "fields": {
+                    "trims": {
+                        "selector": ".MuiGrid-root.MuiGrid-item.MuiGrid-grid-xs-12.MuiGrid-grid-sm-12.MuiGrid-grid-md-12 a",
+                        "all": True,
+                    },
+                },
+            },
+        },
+    }
+    PAYLOAD_FIELDS = {
+        "year": {
+            "fields": {"name": ["modelName"], "url": ["modelUrl"]},
+            "required": ["name", "url"],
+        },
+        "model": {
+            "fields": {"trim": ["trimName"]},
+            "required": ["trim"],
+        },
+    }
 
-    def _process_year(self, make: str, year: str, page: Page):
+    async def _process_year(self, make: str, year: str, page: Page):
         sanitized_make = sanitize_make(make)  # Sanitize the make
         url = CONFIG["base_urls"]["cars"].format(year=year, make = sanitized_make)
         print(url)
 
-        page.goto(url, timeout=60000)
-        time.sleep(5)
-        
-        model_elements = page.query_selector_all(".yearMake_model-wrapper-h3__npC2B h3")
-        for model_element in model_elements:
-            model_name = model_element.inner_text().strip()
+        models = await self._open(page, url)
+        for model in models:
+            model["url"] = urljoin(page.url, model["url"])
+        if not models:
+            models = (await extract(page, self.EXTRACTION_SPEC))["models"]
+
+        # Fetch the model pages side by side, then write them in page order
+        tab_limit = asyncio.Semaphore(CONFIG["model_tabs_per_make"])
+        results = await asyncio.gather(
+            *(self._process_model(page, model["url"], year, make, model["name"], tab_limit)
+              for model in models),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        for rows in results:
+            for row in rows:
+                self.excel.append(self.vehicle_type, row)
+
+
+    async def _process_model(self, page: Page, model_url: str, year: str, make: str, model_name: str,
+                             tab_limit: asyncio.Semaphore) -> List[List[str]]:
+        async with tab_limit:
             print(f"Fetching trims for model: {model_name}...")
-            self._process_model(page, model_element, year, make, model_name)
+            new_tab = None
+            try:
+                if isinstance(page, HttpPage):
+                    new_tab = HttpPage(page.backend)
+                else:
+                    new_tab = await page.context.new_page()
+                    await stealth_async(new_tab)
 
+                records = await self._open(new_tab, model_url, kind="model")
+                if records:
+                    rows = [[year, "cars", make, model_name, record["trim"]] for record in records]
+                    for row in rows:
+                        print(*row)
+                    return rows
 
-    def _process_model(self, page: Page, model_element, year: str, make: str, model_name: str):
-        model_url = model_element.evaluate("node => node.closest('.yearMake_model-wrapper__t8GAv').querySelector('a').href")
-        
-        with page.context.expect_page() as new_tab_info:
-            page.evaluate(f"window.open('{model_url}', '_blank')")
-        new_tab = new_tab_info.value
-        
-        try:
-            invalid_headers = new_tab.query_selector_all('h1, h2, h3')
-            for header in invalid_headers:
-                if 'undefined undefined' in header.inner_text().lower():
+                data = await extract(new_tab, self.MODEL_SPEC)
+                if data["invalid"]:
                     print(f"Skipping model {model_name} due to undefined references in header")
-                    new_tab.close()
-                    self.sheet.append([year, "cars", make, model_name, ''])
-                    self.excel.save()
-                    return
-            new_tab.wait_for_selector(".trimSelection_card-info__O02As", timeout=60000)
-            trim_containers = new_tab.query_selector_all(
-                ".MuiGrid-root.MuiGrid-item.MuiGrid-grid-xs-12.MuiGrid-grid-md-6.trimSelection_card-info__O02As"
-            )
-            
-            for trim_container in trim_containers:
-                # Locate the trim name header
-                trim_name_element = trim_container.query_selector("h3.heading-xs.title.spacing-s")
-                #model_name = trim_name_element.inner_text().strip() if trim_name_element else "Unknown Model"
-
-                # Locate all trims under the model
-                trim_links = trim_container.query_selector_all(
-                    ".MuiGrid-root.MuiGrid-item.MuiGrid-grid-xs-12.MuiGrid-grid-sm-12.MuiGrid-grid-md-12 a"
-                )
-                for trim_link in trim_links:
-                    trim_name = trim_link.inner_text().strip()
-                    print(year, "cars", make, model_name, trim_name)
+                    return [[year, "cars", make, model_name, '']]
 
-                    self.sheet.append([year, "cars", make, model_name, trim_name])
-                    self.excel.save()
-                
-        finally:
-            new_tab.close()
+                rows = []
+                for container in data["trim_containers"]:
+                    for trim_name in container["trims"]:
+                        print(year, "cars", make, model_name, trim_name)
+                        rows.append([year, "cars", make, model_name, trim_name])
+                return rows
+
+            finally:
+                # The tab is closed even when stealth setup fails on it
+                if new_tab is not None:
+                    await new_tab.close()
 
 class RVScraper(BaseScraper):
-    def process_make(self, make: str, years: List[str], selected_years: List[str]):
-        for year in selected_years:
-            if year not in years:
-                continue
-            with BrowserManager() as page:
-                self._process_year(make, year, page)
+    EXTRACTION_SPEC = {
+        "fields": {
+            "tables": {
+                "selector": "table.table-enhanced--model-years",
+                "all": True,
+                "fields": {
+                    "rows": {
+                        "selector": "tbody tr",
+                        "all": True,
+                        "fields": {
+                            "model": {"selector": "td[colspan] h4"},
+                            "category": {"selector": "th h3.category"},
+                            "headers": {"selector": "th h5", "all": True},
+                            "class": {"attr": "class"},
+                            "cells": {"selector": "td", "all": True},
+                        },
+                    },
+                },
+            },
+        },
+    }
 
-    def _process_year(self, make: str, year: str, page: Page):
+    async def _process_year(self, make: str, year: str, page: Page):
         sanitized_make = sanitize_make(make)
         url = CONFIG["base_urls"]["rvs"].format(year=year, make=sanitized_make)
         print(f"Processing: {url}")
         
         try:
-            page.goto(url, timeout=60000)
-            page.wait_for_selector("table.table-enhanced--model-years", timeout=30000)
+            await self._open(page, url)
             
-            tables = page.query_selector_all("table.table-enhanced--model-years")
+            data = await extract(page, self.EXTRACTION_SPEC)
             
-            for table in tables:
+            for table in data["tables"]:
                 current_model = None
                 headers = []
                 
-                rows = table.query_selector_all("tbody tr")
-                
-                for row in rows:
+                for row in table["rows"]:
                     # Handle model headers
-                    if row.query_selector("td[colspan] h4"):
-                        current_model = row.query_selector("h4").inner_text().strip()
+                    if row["model"] is not None:
+                        current_model = row["model"]
                         print(f"Found model: {current_model}")
                         continue
                         
                     # Handle column headers
-                    if row.query_selector("th h3.category"):
-                        headers = [
-                            th.query_selector("h5").inner_text().replace("\n", " ").strip()
-                            for th in row.query_selector_all("th")
-                            if th.query_selector("h5")
-                        ]
+                    if row["category"] is not None:
+                        headers = [header.replace("\n", " ").strip() for header in row["headers"]]
                         if "Model" not in headers:
                             headers.insert(0, "Model")
                         print(f"Detected headers: {headers}")
                         continue
                     
                     # Process data rows - FIXED CLASS CHECK
-                    row_class = row.get_attribute("class") or ""
+                    row_class = row["class"] or ""
                     if "detail-row" in row_class:
-                        columns = row.query_selector_all("td")
+                        columns = row["cells"]
                         if not current_model:
                             current_model = make  # Fallback to make name
                         
                         try:
-                            model_trim = columns[0].inner_text().strip()
+                            model_trim = columns[0]
                         except IndexError:
                             continue
                             
@@ -354,8 +1692,8 @@ class RVScraper(BaseScraper):
                         
                         for idx, header in enumerate(headers[1:], start=1):
                             try:
-                                row_data[header] = columns[idx].inner_text().strip()
-                            except (IndexError, AttributeError):
+                                row_data[header] = columns[idx]
+                            except IndexError:
                                 row_data[header] = "N/A"
                         
                         output = [
@@ -376,8 +1714,7 @@ class RVScraper(BaseScraper):
                         
                         cleaned_output = [str(item) if item else "N/A" for item in output]
                         
-                        self.sheet.append(cleaned_output)
-                        self.excel.save()
+                        self.excel.append(self.vehicle_type, cleaned_output)
                         print(f"Added: {cleaned_output}")
                         
         except Exception as e:
@@ -385,110 +1722,334 @@ class RVScraper(BaseScraper):
             raise
 
 class BoatScraper(BaseScraper):
-    def process_make(self, make: str, years: List[str], selected_years: List[str]):
-        for year in selected_years:
-            if year not in years:
-                continue
-            with BrowserManager() as page:
-                self._process_year(make, year, page)
+    EXTRACTION_SPEC = {
+        "invalid_headers": INVALID_HEADERS,
+        "fields": {
+            "rows": {
+                "selector": ".MuiGrid-root.MuiGrid-item.MuiGrid-grid-md-12.mui-190ub4r",
+                "all": True,
+                "fields": {
+                    "columns": {"selector": ".MuiGrid-root.MuiGrid-item", "all": True},
+                },
+            },
+        },
+    }
 
-    def _process_year(self, make: str, year: str, page: Page):
+    PAYLOAD_FIELDS = {
+        "year": {
+            "fields": {
+                "Model": ["modelName"],
+                "Length": ["overallLength"],
+                "Model Type": ["modelType", "boatType"],
+                "Hull": ["hullMaterial", "hullType"],
+                "CC's": ["displacement"],
+                "Engine(s)": ["numberOfEngines"],
+                "HP": ["horsepower"],
+                "Weight (lbs)": ["weightLbs"],
+                "Fuel Type": ["fuelType"],
+            },
+            "required": ["Model", "Length", "Hull"],
+        },
+    }
+
+    async def _process_year(self, make: str, year: str, page: Page):
         sanitized_make = sanitize_make(make)  # Sanitize the make
         url = CONFIG["base_urls"]["boats"].format(year=year, make=sanitized_make)
         print(f"Processing URL: {url}")
 
-        page.goto(url, timeout=60000)
-        invalid_headers = page.query_selector_all('h1, h2, h3')
-        for header in invalid_headers:
-            if 'undefined undefined' in header.inner_text().lower():
-                print(f"Skipping model {model} due to undefined references in header")
-                page.close()
-                self.sheet.append([year, "boat", make, model, ''])
-                self.excel.save()
-                return
         # Wait for the main content container
-        if page.wait_for_selector(".MuiGrid-container", timeout=15000):
-            # Extract all rows with complete data
-            rows = page.query_selector_all(".MuiGrid-root.MuiGrid-item.MuiGrid-grid-md-12.mui-190ub4r")
-            
-            for row in rows:
-                # Check if the row contains all the required data
-                columns = row.query_selector_all(".MuiGrid-root.MuiGrid-item")
-                if len(columns) == 9:  # Ensure there are 9 columns (Model, Length, Model Type, Hull, CC's, Engine(s), HP, Weight (lbs), Fuel Type)
-                    # Extract the data from each column
-                    model = columns[0].inner_text().strip()
-                    length = columns[1].inner_text().strip()
-                    model_type = columns[2].inner_text().strip()
-                    hull = columns[3].inner_text().strip()
-                    ccs = columns[4].inner_text().strip()
-                    engines = columns[5].inner_text().strip()
-                    hp = columns[6].inner_text().strip()
-                    weight = columns[7].inner_text().strip()
-                    fuel_type = columns[8].inner_text().strip()
-
-                    # Append the data to the Excel sheet
-                    self.sheet.append([
-                        year, "boat", make, model, length, model_type, hull, ccs, engines, hp, weight, fuel_type
-                    ])
-                    self.excel.save()
-                    print(f"Appended row: {[year, 'boat', make, model, length, model_type, hull, ccs, engines, hp, weight, fuel_type]}")
+        records = await self._open(page, url)
+        if records:
+            columns = CONFIG["headers"]["boats"][3:12]
+            for record in records:
+                row = [year, "boat", make] + [record.get(column, "") for column in columns]
+                self.excel.append(self.vehicle_type, row)
+                print(f"Appended row: {row}")
+            return
+
+        data = await extract(page, self.EXTRACTION_SPEC)
+        if data["invalid"]:
+            # The page has no model to record, so there is nothing to append
+            print(f"Skipping {make} {year} due to undefined references in header")
+            return
+
+        for row in data["rows"]:
+            # Check if the row contains all the required data
+            columns = row["columns"]
+            if len(columns) == 9:  # Ensure there are 9 columns (Model, Length, Model Type, Hull, CC's, Engine(s), HP, Weight (lbs), Fuel Type)
+                model, length, model_type, hull, ccs, engines, hp, weight, fuel_type = columns
+
+                # Append the data to the Excel sheet
+                self.excel.append(self.vehicle_type, [
+                    year, "boat", make, model, length, model_type, hull, ccs, engines, hp, weight, fuel_type
+                ])
+                print(f"Appended row: {[year, 'boat', make, model, length, model_type, hull, ccs, engines, hp, weight, fuel_type]}")
 
 
 class MotorcycleScraper(BaseScraper):
-    def process_make(self, make: str, years: List[str], selected_years: List[str]):
-        for year in selected_years:
-            if year not in years:
-                continue
-            with BrowserManager() as page:
-                self._process_year(make, year, page)
+    EXTRACTION_SPEC = {
+        "invalid_headers": INVALID_HEADERS,
+        "fields": {
+            "sections": {
+                "selector": ".spacing-xs + .spacing-s",  # Select the second `.spacing-s` div
+                "all": True,
+                "fields": {
+                    "model": {"selector": "h4.bh-l"},
+                    "trims": {
+                        "selector": ".motorcyclesYearMake_model-link-container__JIYG4 a.motorcyclesYearMake_model-link__Db22K",
+                        "all": True,
+                    },
+                },
+            },
+        },
+    }
 
-    def _process_year(self, make: str, year: str, page: Page):
+    PAYLOAD_FIELDS = {
+        "year": {
+            "fields": {"model": ["modelName"], "trim": ["trimName"]},
+            "required": ["model", "trim"],
+        },
+    }
+
+    async def _process_year(self, make: str, year: str, page: Page):
         sanitized_make = sanitize_make(make)  # Sanitize the make
         url = CONFIG["base_urls"]["motorcycles"].format(year=year, make=sanitized_make)
-        page.goto(url, timeout=60000)
-        
-        page.wait_for_selector(".spacing-xs h3.heading-s", timeout=60000)
-        sections = page.query_selector_all(".spacing-xs + .spacing-s")  # Select the second `.spacing-s` div
-        invalid_headers = page.query_selector_all('h1, h2, h3')
-        for header in invalid_headers:
-            if 'undefined undefined' in header.inner_text().lower():
-                print(f"Skipping model {model_name} due to undefined references in header")
-                page.close()
-                self.sheet.append([year, "motorcycle", make, model_name, ''])
-                self.excel.save()
-                return
-        for section in sections:
-            model_element = section.query_selector("h4.bh-l")
-            if not model_element:
+        records = await self._open(page, url)
+        if records:
+            for record in records:
+                print(f"Found trim: {record['trim']} for model: {record['model']}")
+                self.excel.append(self.vehicle_type, [year, "motorcycle", make, record["model"], record["trim"]])
+            return
+
+        data = await extract(page, self.EXTRACTION_SPEC)
+        if data["invalid"]:
+            # The page has no model to record, so there is nothing to append
+            print(f"Skipping {make} {year} due to undefined references in header")
+            return
+        for section in data["sections"]:
+            model_name = section["model"]
+            if model_name is None:
                 continue
 
-            model_name = model_element.inner_text().strip()
             print(f"Processing model: {model_name}")
 
-            # Fetch trims under the current model
-            trims = section.query_selector_all(
-                ".motorcyclesYearMake_model-link-container__JIYG4 a.motorcyclesYearMake_model-link__Db22K"
-            )
-
-            for trim_element in trims:
-                trim_name = trim_element.inner_text().strip()
+            # Trims under the current model
+            for trim_name in section["trims"]:
                 print(f"Found trim: {trim_name} for model: {model_name}")
-                self.sheet.append([year, "motorcycle", make, model_name, trim_name])
-                self.excel.save()
+                self.excel.append(self.vehicle_type, [year, "motorcycle", make, model_name, trim_name])
+
+
+def check_payload_fixtures(folder: str) -> bool:
+    """Run each scraper's PAYLOAD_FIELDS over its fixture payloads; True if all yield the expected records."""
+    scraper_classes = {
+        "cars": CarScraper,
+        "rvs": RVScraper,
+        "boats": BoatScraper,
+        "motorcycles": MotorcycleScraper,
+    }
+    passed = True
+    for name in sorted(os.listdir(folder)):
+        if not name.endswith(".json"):
+            continue
+        vehicle_type, _, kind = os.path.splitext(name)[0].partition("_")
+        with open(os.path.join(folder, name), encoding="utf-8") as f:
+            fixture = json.load(f)
+        records = payload_records([fixture["payload"]], **scraper_classes[vehicle_type].PAYLOAD_FIELDS[kind])
+        if records == fixture["records"]:
+            print(f"{name}: {len(records)} record(s) as expected")
+        else:
+            passed = False
+            print(f"{name}: expected {fixture['records']}, got {records}")
+    return passed
+
+
+class RestartRequested(Exception):
+    """Raised when too many scrapes failed and the run should be restarted."""
+
+
+class ScrapeEngine:
+    """Runs make-year jobs concurrently over the shared browser pool."""
+
+    def __init__(self, scraper_map: Dict[str, BaseScraper], checkpoint: CheckpointManager,
+                 excel_manager: ExcelManager, concurrency: int,
+                 schedule: Optional[ScheduleManager] = None):
+        self.scraper_map = scraper_map
+        self.checkpoint = checkpoint
+        self.schedule = schedule
+        self.job_queue: Optional[JobQueue] = None
+        self.owner = None
+        self.held = set()  # Leased make-years not yet completed or failed
+        self.in_progress = set()  # Leased make-years still being scraped
+        self.excel = excel_manager
+        self.concurrency = max(1, concurrency)
+        self.count_of_failures = 0
+
+    async def run(self, jobs: List[Tuple[str, str, List[str], str]]):
+        queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+        print(f"Scraping {len(jobs)} make-year(s) with {self.concurrency} worker(s)")
+
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def run_queue(self, job_queue: JobQueue, owner: str, vehicle_types: List[str]):
+        """Lease and scrape jobs from a shared queue until none are pending or leased."""
+        self.job_queue = job_queue
+        self.owner = owner
+        print(f"Worker {owner} draining {job_queue.queue_file} with {self.concurrency} worker(s)")
+
+        heartbeat = asyncio.create_task(self._heartbeat())
+        workers = [asyncio.create_task(self._queue_worker(vehicle_types)) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers + [heartbeat]:
+                task.cancel()
+            await asyncio.gather(*workers, heartbeat, return_exceptions=True)
+            # Jobs cut short go straight back; finished ones complete when their rows are flushed
+            if self.in_progress:
+                job_queue.release(owner, list(self.in_progress))
+                self.held -= self.in_progress
+                self.in_progress.clear()
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(CONFIG["queue"]["heartbeat"])
+            if self.held:
+                for key in self.job_queue.heartbeat(self.owner, list(self.held)):
+                    print(f"Lost the lease on {'/'.join(key)}; another worker may scrape it again")
+
+    async def _queue_worker(self, vehicle_types: List[str]):
+        while True:
+            job = self.job_queue.lease(self.owner, vehicle_types)
+            if job is None:
+                # Saving buffered rows completes our own finished jobs
+                self.excel.flush()
+                if not self.job_queue.has_unfinished(vehicle_types):
+                    return
+                await asyncio.sleep(CONFIG["queue"]["poll_interval"])
+                continue
+            vehicle_type, make, years, year = job
+            key = (vehicle_type, make, year)
+            self.held.add(key)
+            self.in_progress.add(key)
+            try:
+                done = await self._run_job(vehicle_type, make, years, year)
+            finally:
+                self.in_progress.discard(key)
+            if not done:
+                self.held.discard(key)
+                self.job_queue.fail(self.owner, key, "retries exhausted")
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            try:
+                vehicle_type, make, years, year = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await self._run_job(vehicle_type, make, years, year)
+
+    async def _run_job(self, vehicle_type: str, make: str, years: List[str], year: str) -> bool:
+        """Scrape one make-year with retries; returns False if every retry failed."""
+        scraper = self.scraper_map[vehicle_type]
+        retries = 10
+        while retries > 0:
+            if self.schedule:
+                self.schedule.begin(vehicle_type, make, year)
+            try:
+                await scraper.process_make(make, years, [year])
+                fingerprint = self.schedule.fingerprint(vehicle_type, make, year) if self.schedule else None
+
+                # Only mark the make-year done once its rows are on disk
+                def mark_done():
+                    self.checkpoint.update_progress(vehicle_type, make, year)
+                    if fingerprint:
+                        self.schedule.record(vehicle_type, make, year, *fingerprint)
+                    if self.job_queue:
+                        self.job_queue.complete((vehicle_type, make, year))
+                        self.held.discard((vehicle_type, make, year))
+
+                self.excel.when_flushed(mark_done)
+                return True
+            except Exception as e:
+                if self.schedule:
+                    self.schedule.discard(vehicle_type, make, year)
+                retries -= 1
+                self.count_of_failures += 1
+                if self.count_of_failures >= 20:
+                    raise RestartRequested() from e
+                if retries == 0:
+                    ErrorHandler.handle_error(
+                        self.checkpoint, e,
+                        context=f"{vehicle_type}/{make}/{year}"
+                    )
+                    return False
+                # Back off exponentially with jitter instead of a flat minute
+                attempt = 10 - retries
+                delay = min(CONFIG["retry"]["max_delay"], CONFIG["retry"]["base_delay"] * 2 ** (attempt - 1))
+                delay *= random.uniform(0.5, 1.0)
+                print(f"Retrying {vehicle_type}/{make}/{year} in {delay:.0f}s ({retries} left)...")
+                await asyncio.sleep(delay)
 
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Scrape vehicle data from JDPower.")
-    parser.add_argument("--years", type=str, required=True, help="Year or year range")
+    parser.add_argument("--years", type=str, help="Year or year range")
     parser.add_argument("-c", action="store_true", help="Process cars")
     parser.add_argument("-r", action="store_true", help="Process RVs")
     parser.add_argument("-b", action="store_true", help="Process boats")
     parser.add_argument("-m", action="store_true", help="Process motorcycles")
     parser.add_argument("-all", action="store_true", help="Process all vehicle types")
+    parser.add_argument("--concurrency", type=int, default=CONFIG["concurrency"],
+                        help="Number of make-year jobs scraped in parallel")
+    parser.add_argument("--backend", action="append", default=[], metavar="TYPE=MODE",
+                        help="Fetch backend for a vehicle type, e.g. rvs=http or cars=browser")
+    parser.add_argument("--no-resource-filter", action="store_true",
+                        help="Let the browser load images, fonts, ads and analytics")
+    parser.add_argument("--base-url", help="Site to scrape instead of CONFIG['site_url'], e.g. a local fixture server")
+    parser.add_argument("--storage", choices=["sqlite", "xlsx"], default=CONFIG["storage"],
+                        help="Where scraped rows are kept while the run is in progress")
+    parser.add_argument("--export-only", action="store_true",
+                        help="Only export the SQLite store to the xlsx output file")
+    parser.add_argument("--check-payloads", action="store_true",
+                        help="Check the json extraction fields against the placeholder payloads in payload_fixtures/")
+    parser.add_argument("--merge", nargs="+", metavar="DATABASE",
+                        help="Merge the SQLite stores of other hosts into the local one, then export")
+    parser.add_argument("--delta", action="store_true",
+                        help="Scrape only the new make-years listed in initial_dataset/*.delta.csv; "
+                             "--years becomes optional")
+    parser.add_argument("--scheduled", action="store_true",
+                        help="Skip make-years scraped less than --ttl-days ago; --years becomes optional")
+    parser.add_argument("--ttl-days", type=float, default=CONFIG["schedule"]["ttl_days"],
+                        help="How long a scraped make-year stays fresh for --scheduled")
+    parser.add_argument("--queue", nargs="?", const=CONFIG["queue"]["file"], metavar="PATH",
+                        help="Share make-year jobs through a queue file that other workers can drain "
+                             f"(default: {CONFIG['queue']['file']}). Without --years, --delta or "
+                             "--scheduled nothing is enqueued and the worker only drains")
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}:{os.getpid()}",
+                        help="Name this worker's leases are held under")
+    parser.add_argument("--queue-status", action="store_true", help="Print the job queue's counts and exit")
+    parser.add_argument("--requeue-dead", action="store_true",
+                        help="Move dead-lettered jobs back to pending and exit")
+    parser.add_argument("--extraction", choices=["dom", "json"],
+                        help="Extraction mode for every vehicle type; json is unverified against the live site "
+                             "(default: CONFIG['extraction_mode'])")
     return parser.parse_args()
 
-def process_arguments(args) -> Tuple[List[str], List[str]]:
-    if "-" in args.years:
+def process_arguments(args) -> Tuple[Optional[List[str]], List[str]]:
+    """Selected years (None for every listed year, only with --delta or --scheduled) and vehicle types."""
+    if not args.years and not (args.delta or args.scheduled or args.queue):
+        print("--years is required!")
+        sys.exit(1)
+    if not args.years:
+        years = None
+    elif "-" in args.years:
         start, end = map(int, args.years.split("-"))
         years = list(map(str, range(start, end + 1)))
     else:
@@ -509,68 +2070,208 @@ def process_arguments(args) -> Tuple[List[str], List[str]]:
     
     return years, types
 
+async def run_scrape(selected_years: Optional[List[str]], selected_types: List[str],
+                     checkpoint: CheckpointManager, excel_manager: ExcelManager,
+                     concurrency: int, schedule: ScheduleManager, scheduled: bool = False,
+                     job_queue: Optional[JobQueue] = None, worker_id: Optional[str] = None,
+                     enqueue: bool = True) -> bool:
+    """Scrape every pending make-year; returns True if a restart was requested.
+
+    With ``scheduled``, make-years the schedule still considers fresh are skipped.
+    With a ``job_queue``, the make-years are added to it (unless ``enqueue`` is
+    False) and this process then drains it alongside any other workers.
+    """
+    readiness = PageReadiness(CONFIG["readiness"], CONFIG["readiness_stats_file"])
+    async with AsyncExitStack() as stack:
+        # Only start the backends the selected vehicle types actually use
+        backends = {}
+        wanted = {CONFIG["fetch_backend"][vehicle_type] for vehicle_type in selected_types}
+        if "browser" in wanted:
+            resource_filter = None
+            if CONFIG["resource_filter"]["enabled"]:
+                resource_filter = ResourceFilter(CONFIG["resource_filter"])
+            backends["browser"] = await stack.enter_async_context(BrowserManager(
+                pool_size=concurrency,
+                max_navigations=CONFIG["browser_pool"]["max_navigations"],
+                resource_filter=resource_filter,
+            ))
+        if "http" in wanted:
+            backends["http"] = await stack.enter_async_context(HttpBackend(
+                max_connections=CONFIG["http"]["max_connections"],
+                timeout=CONFIG["http"]["timeout"],
+                headers=CONFIG["http"]["headers"],
+            ))
+        scraper_classes = {
+            "cars": CarScraper,
+            "rvs": RVScraper,
+            "boats": BoatScraper,
+            "motorcycles": MotorcycleScraper,
+        }
+        scraper_map = {
+            vehicle_type: scraper_classes[vehicle_type](
+                excel_manager, backends[CONFIG["fetch_backend"][vehicle_type]], readiness, vehicle_type
+            )
+            for vehicle_type in selected_types
+        }
+        jobs = []
+        fresh = 0
+        for vehicle_type in (selected_types if enqueue else []):
+            scraper = scraper_map[vehicle_type]
+            makes = scraper.read_csv(CONFIG["input_files"][vehicle_type])
+            for make, years in makes:
+                for year in (years if selected_years is None else selected_years):
+                    if year not in years or not checkpoint.should_process(vehicle_type, make, year):
+                        continue
+                    if scheduled and not schedule.is_due(vehicle_type, make, year):
+                        fresh += 1
+                        continue
+                    jobs.append((vehicle_type, make, years, year))
+        if scheduled:
+            print(f"Skipping {fresh} make-year(s) scraped in the last {CONFIG['schedule']['ttl_days']} days "
+                  f"({CONFIG['schedule']['stable_ttl_days']} for unchanged ones)")
+
+        excel_manager.add_observer(schedule.observe)
+        engine = ScrapeEngine(scraper_map, checkpoint, excel_manager, concurrency, schedule)
+        try:
+            if job_queue:
+                if enqueue:
+                    print(f"Queued {job_queue.enqueue(jobs)} make-year(s) of {len(jobs)}")
+                await engine.run_queue(job_queue, worker_id, selected_types)
+            else:
+                await engine.run(jobs)
+        except RestartRequested:
+            return True
+        finally:
+            for backend in backends.values():
+                backend.report()
+            readiness.report()
+            for vehicle_type in selected_types:
+                scraper = scraper_map[vehicle_type]
+                if scraper.extraction_mode == "json":
+                    print(f"Payload extraction for {vehicle_type}: "
+                          f"{scraper.payload_stats['hits']} hit(s), {scraper.payload_stats['misses']} fallback(s)")
+    return False
+
+def prune_delta(path: str, vehicle_type: str, scraped) -> int:
+    """Remove the make-years ``scraped(vehicle_type, make, year)`` accepts from a delta CSV.
+
+    The rest are written back atomically and the file is deleted once none
+    are left; returns how many remain.
+    """
+    remaining = []
+    for make, years in BaseScraper.read_csv(path):
+        left = [year for year in years if year and not scraped(vehicle_type, make, year)]
+        if left:
+            remaining.append((make, left))
+    if not remaining:
+        os.remove(path)
+        return 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Make", "Available Years"])
+        for make, years in remaining:
+            writer.writerow([make, ", ".join(years)])
+    os.replace(tmp_path, path)
+    return sum(len(years) for _, years in remaining)
+
 def main():
     args = parse_arguments()
+    if args.check_payloads:
+        sys.exit(0 if check_payload_fixtures(CONFIG["payload_fixtures_folder"]) else 1)
+    if args.export_only or args.merge:
+        storage = SqliteStorage(CONFIG["database_file"], CONFIG["output_file"])
+        for database_path in args.merge or []:
+            added = storage.merge(database_path)
+            print(f"Merged {database_path}: " + ", ".join(
+                f"{count} new {vehicle_type} row(s)" for vehicle_type, count in added.items()))
+        storage.export()
+        storage.close()
+        return
+    if args.queue_status or args.requeue_dead:
+        job_queue = JobQueue(args.queue or CONFIG["queue"]["file"])
+        if args.requeue_dead:
+            print(f"Requeued {job_queue.requeue_dead()} dead job(s)")
+        job_queue.report()
+        job_queue.close()
+        return
     selected_years, selected_types = process_arguments(args)
+    if args.extraction:
+        for vehicle_type in CONFIG["extraction_mode"]:
+            CONFIG["extraction_mode"][vehicle_type] = args.extraction
+    for choice in args.backend:
+        vehicle_type, _, mode = choice.partition("=")
+        if vehicle_type not in CONFIG["fetch_backend"] or mode not in ("http", "browser"):
+            print(f"Invalid --backend {choice!r}, expected e.g. rvs=http")
+            sys.exit(1)
+        CONFIG["fetch_backend"][vehicle_type] = mode
+    delta_files = {}
+    if args.delta:
+        for vehicle_type in list(selected_types):
+            path = os.path.splitext(CONFIG["input_files"][vehicle_type])[0] + ".delta.csv"
+            if not os.path.exists(path):
+                print(f"No new {vehicle_type} make-years in {path}, skipping {vehicle_type}")
+                selected_types.remove(vehicle_type)
+                continue
+            CONFIG["input_files"][vehicle_type] = path
+            delta_files[vehicle_type] = path
+        if not selected_types:
+            return
+    CONFIG["schedule"]["ttl_days"] = args.ttl_days
+    if args.no_resource_filter:
+        CONFIG["resource_filter"]["enabled"] = False
+    if args.base_url:
+        for vehicle_type, url in CONFIG["base_urls"].items():
+            CONFIG["base_urls"][vehicle_type] = url.replace(CONFIG["site_url"], args.base_url.rstrip("/"), 1)
     
     checkpoint = CheckpointManager()
-    excel_manager = ExcelManager(CONFIG["output_file"])
-    
-    scraper_map = {
-        "cars": CarScraper(excel_manager, "cars"),
-        "rvs": RVScraper(excel_manager, "rvs"),
-        "boats": BoatScraper(excel_manager, "boats"),
-        "motorcycles": MotorcycleScraper(excel_manager, "motorcycles")
-    }
-    last_clean_time = time.time()  # Initialize cleaning timer
+    schedule = ScheduleManager(CONFIG["schedule_file"], CONFIG["schedule"]["ttl_days"],
+                               CONFIG["schedule"]["stable_after_days"], CONFIG["schedule"]["stable_ttl_days"])
+    job_queue = None
+    if args.queue:
+        job_queue = JobQueue(args.queue, CONFIG["queue"]["visibility_timeout"], CONFIG["queue"]["max_attempts"])
+    excel_manager = ExcelManager(
+        open_storage(args.storage),
+        flush_rows=CONFIG["excel_flush"]["rows"],
+        flush_interval=CONFIG["excel_flush"]["seconds"],
+    )
+    excel_manager.install_signal_handlers()
     
+    enqueue = bool(args.years or args.delta or args.scheduled)
+    # Workers that only drain a queue leave exporting and the checkpoint to the run that filled it
+    drain_only = job_queue is not None and not enqueue
     try:
-        count_of_failures = 0
-        for vehicle_type in selected_types:
-            scraper = scraper_map[vehicle_type]
-            makes = scraper.read_csv(CONFIG["input_files"][vehicle_type])
-            
-            for make, years in makes:
-                try:
-                    for year in selected_years:
-                        if year not in years or not checkpoint.should_process(vehicle_type, make, year):
-                            continue
-                        
-                        retries = 10
-                        while retries > 0:
-                            try:
-                                scraper.process_make(make, years, [year])
-                                checkpoint.update_progress(vehicle_type, make, year)
-                                break
-                            except Exception as e:
-                                retries -= 1
-                                count_of_failures +=1
-                                if count_of_failures == 20:
-                                    print("Reached 20 failures, exiting after 5 mins with restart code")
-                                    time.sleep(300)  # Wait before retrying
-                                    sys.exit(100)  # Use a special exit code for restart
-                                if retries == 0:
-                                    raise
-                                print(f"Retrying {vehicle_type}/{make}/{year} ({retries} left)...")
-                                time.sleep(60)  # Wait before retrying
-
-                        # Check if 10 minutes have passed since last clean
-                        if time.time() - last_clean_time >= 600:
-                            print("\nPerforming scheduled cleaning...")
-                            excel_manager.clean_duplicates()
-                            
-                            last_clean_time = time.time()        
-                except Exception as e:
-                    ErrorHandler.handle_error(
-                        checkpoint, e,
-                        context=f"{vehicle_type}/{make}"
-                    )
-                    continue  # Continue with next make
-        cleanDuplicateHeaders()
+        try:
+            restart = asyncio.run(run_scrape(
+                selected_years, selected_types, checkpoint, excel_manager, args.concurrency,
+                schedule, args.scheduled, job_queue, args.worker_id, enqueue
+            ))
+        finally:
+            excel_manager.flush()
+            # Fingerprints are recorded as rows reach disk, so report after the last flush
+            schedule.report()
+            if job_queue:
+                job_queue.report()
+        if not drain_only:
+            excel_manager.export()
+        if restart:
+            print("Reached 20 failures, exiting after 5 mins with restart code")
+            time.sleep(300)  # Wait before retrying
+            sys.exit(100)  # Use a special exit code for restart
+        if drain_only:
+            print("Queue worker finished; export with --export-only, or --merge the stores of other hosts")
+            return
+        # Only make-years that were actually scraped leave the delta; failed
+        # ones, other --years and years added during the run stay for next time
+        def scraped(vehicle_type, make, year):
+            return not checkpoint.should_process(vehicle_type, make, year) or \
+                (job_queue is not None and job_queue.is_done((vehicle_type, make, year)))
+        for vehicle_type, path in delta_files.items():
+            left = prune_delta(path, vehicle_type, scraped)
+            print(f"{path}: {left} make-year(s) still to scrape" if left else f"Deleted scraped delta file: {path}")
         # Delete checkpoint file after successful completion
-        if os.path.exists(checkpoint.checkpoint_file):
-            os.remove(checkpoint.checkpoint_file)
-            print(f"Successfully deleted checkpoint file: {checkpoint.checkpoint_file}")
+        checkpoint.clear()
+        print(f"Successfully deleted checkpoint file: {checkpoint.checkpoint_file}")
     except KeyboardInterrupt:
         print("\nKeyboard interrupt received. Saving checkpoint...")
         checkpoint.save()
@@ -580,5 +2281,11 @@ def main():
         ErrorHandler.handle_error(checkpoint, e)
         sys.exit(1)
 
+    finally:
+        excel_manager.close()
+        schedule.close()
+        if job_queue:
+            job_queue.close()
+
 if __name__ == "__main__":
     main()
@@ -1,6 +1,11 @@
+import argparse
+import asyncio
 import csv
-from playwright.sync_api import sync_playwright
-from playwright_stealth import stealth_sync
+import json
+import os
+from urllib.parse import urljoin
+from playwright.async_api import async_playwright
+from playwright_stealth import stealth_async
 import time
 
 # Base URLs and their specific selectors for different vehicle types
@@ -23,108 +28,251 @@ vehicle_types = {
     }
 }
 
-# Function to scrape data for a given vehicle type
-def scrape_makes_and_years(vehicle_type, details):
-    output_file = f"{vehicle_type}_makes_and_years.csv"
+output_folder = "initial_dataset"  # Where generate_full_dataset.py reads the makes and years from
+tabs_per_type = 4  # Make pages of one vehicle type open at once
+max_attempts = 3  # Tries per page before it is given up on
+retry_delay = 5  # Seconds before the first retry, doubled after each failure
+refresh_ttl_days = 7  # Makes checked more recently than this are not revisited
 
-    with sync_playwright() as p:
-        while True:
-            try:
-                # Launch Firefox with stealth mode
-                browser = p.firefox.launch(headless=True)  # Set to True for headless mode
-                context = browser.new_context()
-                page = context.new_page()
-                page.goto(details["url"], wait_until="domcontentloaded", timeout=30000)
-
-                time.sleep(5)
-                break
-            except:
-                print('Retrying...')
-                browser.close()
+
+def output_paths(vehicle_type):
+    """The merged CSV, its delta of newly available years and the per-make refresh state."""
+    base = os.path.join(output_folder, f"{vehicle_type}_makes_and_years")
+    return f"{base}.csv", f"{base}.delta.csv", f"{base}.state.json"
+
+
+def _year_key(year):
+    return int(year) if year.isdigit() else -1
+
+
+def load_makes(path):
+    """Read a makes CSV into {make: [years, newest first]}, merging duplicate rows."""
+    makes = {}
+    if not os.path.exists(path):
+        return makes
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file)
+        next(reader, None)  # Skip header
+        for row in reader:
+            if len(row) < 2 or not row[0]:
                 continue
+            years = makes.setdefault(row[0], [])
+            years.extend(year for year in row[1].split(", ") if year and year not in years)
+    return {make: sorted(years, key=_year_key, reverse=True) for make, years in makes.items()}
 
-        # Open CSV file for appending
-        with open(output_file, mode="a", newline="", encoding="utf-8") as file:
-            writer = csv.writer(file)
 
-            file.seek(0, 2)  # Move to the end of the file
-            if file.tell() == 0:
-                writer.writerow(["Make", "Available Years"])  # Write header if file is empty
+def write_makes(path, makes):
+    """Write {make: years} as a makes CSV, swapping it in only once complete."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Make", "Available Years"])
+        for make, years in makes.items():
+            writer.writerow([make, ", ".join(years)])
+    os.replace(temp_path, path)
 
-            try:
-                # Wait for the list of makes to load
-                page.wait_for_selector(details["selector"], timeout=30000)
-
-                # Find all make links
-                makes = page.query_selector_all(details["selector"])
-
-                for make in makes:
-                    make_name = make.inner_text().strip()
-                    make_url = make.get_attribute("href")
-                    if not make_url:
-                        continue
-                    print(f"Fetching years for: {make_name} ({vehicle_type}) - {make_url}")
-                    while True:
-                        try:
-                            # Open the make's page in a new tab
-                            with context.expect_page() as new_tab_event:
-                                page.evaluate(f"window.open('{make_url}', '_blank');")
-                            new_tab = new_tab_event.value
-                            new_tab.wait_for_load_state()
-
-                            try:
-                                if vehicle_type == "cars":
-                                    # Keep cars functionality unchanged
-                                    new_tab.wait_for_selector("#Year-customized-select", timeout=10000)
-                                    new_tab.click("#Year-customized-select")
-                                    year_options = new_tab.query_selector_all("li.MuiMenuItem-root")
-                                    available_years = [option.inner_text().strip() for option in year_options]
-
-                                elif vehicle_type == "rvs":
-                                    # Handle RV dropdown
-                                    new_tab.wait_for_selector("select.js-nav-select", timeout=10000)
-                                    year_dropdown = new_tab.query_selector("select.js-nav-select")
-                                    options = year_dropdown.query_selector_all("option")
-                                    available_years = [option.inner_text().strip() for option in options]
-
-                                elif vehicle_type in ["boats", "motorcycles"]:
-                                    # Handle boats and motorcycles dropdown
-                                    new_tab.wait_for_selector("#Year-customized-select", timeout=10000)
-                                    new_tab.click("#Year-customized-select")
-                                    year_options = new_tab.query_selector_all("li[role='option']")
-                                    available_years = [option.inner_text().strip() for option in year_options]
-
-                                print(f"Available years for {make_name} ({vehicle_type}): {available_years}")
-
-                                # Append the make and years to the CSV file
-                                writer.writerow([make_name, ", ".join(available_years)])
-
-                            except Exception as e:
-                                print(f"Error fetching years for {make_name} ({vehicle_type}): {e}")
-
-                            finally:
-                                # Close the new tab and return to the main page
-                                new_tab.close()
-                                break
-                        except:
-                            try:
-                                new_tab.close()
-                            except:
-                                pass
-                            continue
 
+def load_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_state(path, state):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(state, file, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+async def open_makes_list(context, vehicle_type, details):
+    """Open the manufacturers page and return the (make name, url) pairs it lists.
+
+    Raises the last error once max_attempts tries have failed.
+    """
+    for attempt in range(1, max_attempts + 1):
+        page = await context.new_page()
+        try:
+            await page.goto(details["url"], wait_until="domcontentloaded", timeout=30000)
+
+            # Wait for the list of makes itself rather than a fixed delay
+            start = time.perf_counter()
+            await page.wait_for_selector(details["selector"], timeout=30000)
+            print(f"Makes list for {vehicle_type} ready after {time.perf_counter() - start:.2f}s")
+
+            makes = []
+            for make in await page.query_selector_all(details["selector"]):
+                make_name = (await make.inner_text()).strip()
+                make_url = await make.get_attribute("href")
+                if make_url:
+                    makes.append((make_name, urljoin(details["url"], make_url)))
+            return makes
+        except Exception as e:
+            print(f"Error opening {vehicle_type} makes list, attempt {attempt}/{max_attempts}: {e}")
+            if attempt == max_attempts:
+                raise
+        finally:
+            await page.close()
+        await asyncio.sleep(retry_delay * 2 ** (attempt - 1))
+
+
+async def read_years(tab, vehicle_type):
+    """Read the year options from a make page that is already loaded in tab."""
+    if vehicle_type == "cars":
+        # Keep cars functionality unchanged
+        await tab.wait_for_selector("#Year-customized-select", timeout=10000)
+        await tab.click("#Year-customized-select")
+        year_options = await tab.query_selector_all("li.MuiMenuItem-root")
+
+    elif vehicle_type == "rvs":
+        # Handle RV dropdown
+        await tab.wait_for_selector("select.js-nav-select", timeout=10000)
+        year_dropdown = await tab.query_selector("select.js-nav-select")
+        year_options = await year_dropdown.query_selector_all("option")
+
+    else:
+        # Handle boats and motorcycles dropdown
+        await tab.wait_for_selector("#Year-customized-select", timeout=10000)
+        await tab.click("#Year-customized-select")
+        year_options = await tab.query_selector_all("li[role='option']")
+
+    return [(await option.inner_text()).strip() for option in year_options]
+
+
+async def fetch_years(tabs, vehicle_type, make_name, make_url):
+    """Fetch one make's years on a tab borrowed from the pool; None if every attempt failed."""
+    tab = await tabs.get()
+    print(f"Fetching years for: {make_name} ({vehicle_type}) - {make_url}")
+    try:
+        for attempt in range(1, max_attempts + 1):
+            try:
+                await tab.goto(make_url, wait_until="domcontentloaded", timeout=30000)
+                available_years = await read_years(tab, vehicle_type)
+                print(f"Available years for {make_name} ({vehicle_type}): {available_years}")
+                return available_years
             except Exception as e:
-                print(f"Error processing {vehicle_type} makes: {e}")
+                print(f"Error fetching years for {make_name} ({vehicle_type}), attempt {attempt}/{max_attempts}: {e}")
+        return None
+    finally:
+        tabs.put_nowait(tab)
+
+
+# Function to scrape data for a given vehicle type
+async def scrape_makes_and_years(browser, vehicle_type, details, tab_count=tabs_per_type,
+                                 ttl_days=refresh_ttl_days, full=False):
+    """Refresh one vehicle type's makes CSV.
+
+    Only makes that are new, whose URL changed or that were last checked
+    more than ttl_days ago are revisited (every make with full=True). The
+    merged CSV is rewritten atomically. Newly available years are added to
+    the delta CSV, which keeps them until the full scrape has consumed it.
+    """
+    output_file, delta_file, state_file = output_paths(vehicle_type)
+    os.makedirs(output_folder, exist_ok=True)
+    existing = load_makes(output_file)
+    state = load_state(state_file)
+    now = time.time()
+    # Makes already in the CSV but without state count as checked when the CSV was last written
+    csv_checked = os.path.getmtime(output_file) if os.path.exists(output_file) else 0
+
+    def is_stale(make_name, make_url):
+        if full or make_name not in existing:
+            return True
+        known = state.get(make_name, {})
+        return known.get("url", make_url) != make_url or \
+            now - known.get("checked", csv_checked) > ttl_days * 86400
+
+    context = await browser.new_context()
+    try:
+        makes = await open_makes_list(context, vehicle_type, details)
+        stale = [(make_name, make_url) for make_name, make_url in makes if is_stale(make_name, make_url)]
+        print(f"{len(stale)} of {len(makes)} {vehicle_type} makes to revisit (new, moved or older than {ttl_days} days)")
+
+        results = []
+        if stale:
+            # A fixed pool of tabs is reused for every make page
+            tabs = asyncio.Queue()
+            for _ in range(max(1, min(tab_count, len(stale)))):
+                tab = await context.new_page()
+                await stealth_async(tab)
+                tabs.put_nowait(tab)
 
-        browser.close()
-        print(f"Data appended to {output_file}")
+            results = await asyncio.gather(*(fetch_years(tabs, vehicle_type, make_name, make_url)
+                                             for make_name, make_url in stale))
+    finally:
+        await context.close()
 
-# Main function to scrape all vehicle types sequentially
-def scrape_all_vehicle_types():
-    for vehicle_type, details in vehicle_types.items():
-        print(f"Starting scrape for {vehicle_type}...")
-        scrape_makes_and_years(vehicle_type, details)
+    # Merge fresh years over the existing ones; makes that failed keep what they had
+    fetched = {make_name: available_years for (make_name, _), available_years in zip(stale, results)
+               if available_years is not None}
+    # New years join those still waiting in the delta; generate_full_dataset.py --delta deletes it once scraped
+    merged, delta = {}, load_makes(delta_file)
+    new_count = 0
+    for make_name, make_url in makes:
+        if make_name in fetched:
+            merged[make_name] = fetched[make_name]
+            state[make_name] = {"url": make_url, "checked": now}
+            pending = delta.get(make_name, [])
+            new_years = [year for year in fetched[make_name]
+                         if year not in existing.get(make_name, []) and year not in pending]
+            if new_years:
+                delta[make_name] = sorted(pending + new_years, key=_year_key, reverse=True)
+                new_count += len(new_years)
+        elif make_name in existing:
+            merged[make_name] = existing[make_name]
+            state.setdefault(make_name, {"url": make_url, "checked": csv_checked})
+    # Keep makes that dropped off the listing page rather than losing their years
+    for make_name, years in existing.items():
+        merged.setdefault(make_name, years)
+
+    write_makes(output_file, merged)
+    if new_count:
+        write_makes(delta_file, delta)
+    save_state(state_file, state)
+    print(f"{output_file}: {len(merged)} makes, {len(fetched)} refreshed; "
+          f"{new_count} new make-years added to {delta_file}")
+
+
+async def scrape_vehicle_type(browser, vehicle_type, details, tab_count, ttl_days, full):
+    print(f"Starting scrape for {vehicle_type}...")
+    try:
+        await scrape_makes_and_years(browser, vehicle_type, details, tab_count, ttl_days, full)
         print(f"Completed scrape for {vehicle_type}.\n")
+    except Exception as e:
+        print(f"Error processing {vehicle_type} makes: {e}")
+
+
+# Main function to scrape all vehicle types in parallel, each in its own browser context
+async def scrape_all_vehicle_types(tab_count=tabs_per_type, ttl_days=refresh_ttl_days, full=False):
+    async with async_playwright() as p:
+        browser = await p.firefox.launch(headless=True)  # Set to True for headless mode
+        try:
+            await asyncio.gather(*(scrape_vehicle_type(browser, vehicle_type, details, tab_count, ttl_days, full)
+                                   for vehicle_type, details in vehicle_types.items()))
+        finally:
+            await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the makes and years of every vehicle type.")
+    parser.add_argument(
+        "--tabs", type=int, default=tabs_per_type,
+        help=f"Make pages fetched at once per vehicle type (default: {tabs_per_type})"
+    )
+    parser.add_argument(
+        "--ttl-days", type=float, default=refresh_ttl_days,
+        help=f"Revisit makes last checked more than this many days ago (default: {refresh_ttl_days})"
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="Revisit every make, not just new or stale ones"
+    )
+    args = parser.parse_args()
+
+    start_time = time.time()
+    asyncio.run(scrape_all_vehicle_types(max(1, args.tabs), args.ttl_days, args.full))
+    print(f"Total execution time: {time.time() - start_time:.2f} seconds")
+
 
-# Run the function
-scrape_all_vehicle_types()
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,23 @@
 import argparse
-import pandas as pd
+import csv
 import openpyxl
 import sys
 import os
 import time
 import asyncio
+import sqlite3
+import hashlib
+import json
+import re
+import threading
+import httpx
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from urllib.parse import urljoin
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_ollama.llms import OllamaLLM
+from ollama import ResponseError
 
 
 # Set the appropriate event loop policy for Windows
@@ -15,40 +26,416 @@ if sys.platform.startswith('win'):
 
 # File paths
 input_file = 'full_dataset/vehicle_data.xlsx'
+database_file = 'full_dataset/vehicle_data.sqlite'  # Scraper's primary store
+# Dataset the reviews are read from: 'sqlite', 'xlsx', or 'auto' for whichever was written last
+dataset_source = 'auto'
 output_folder = 'output_blurbs'
 
+# Rows are read and handed to the review loop this many at a time
+chunk_size = 200
 
+# Finished reviews are cached here by prompt, so duplicate rows and re-runs skip the LLM
+cache_file = f'{output_folder}/review_cache.sqlite'
+cache_max_entries = 100000
+
+# Columns that identify a row; a row's resume key is a hash of these
+key_columns = {
+    'cars': ['Year', 'Make', 'Model', 'Trim'],
+    'rvs': ['Year', 'Make', 'Model', 'Trim'],
+    'motorcycles': ['Year', 'Make', 'Model', 'Trim'],
+    # Boat variants are only told apart by their specs
+    'boats': ['Year', 'Make', 'Model', 'Length', 'Model Type', 'Hull', "CC's",
+              'Engine(s)', 'HP', 'Weight (lbs)', 'Fuel Type'],
+}
+
+
+
+# Ollama settings shared by every review call
+ollama_model = "deepseek-r1"
+# Inference hosts; OLLAMA_HOSTS takes a comma-separated list
+ollama_urls = [url.strip() for url in os.environ.get("OLLAMA_HOSTS", "http://127.0.0.1:11434/").split(",") if url.strip()]
+ollama_max_per_backend = int(os.environ.get("OLLAMA_NUM_PARALLEL", 4))  # Requests in flight per host
+ollama_temperature = 0.3  # Lower temperature to reduce hallucinations
+ollama_keep_alive = "30m"  # Keep the model loaded between calls instead of reloading it
+ollama_timeout = 300  # Seconds before a request is abandoned and retried on another host
+ollama_health_interval = 15  # Seconds between health checks of every host
+
+# Reviews are streamed and cut off once the answer is long enough
+review_max_words = 150  # The prompt asks for at most 150 words; 0 disables the cut-off
+review_max_tokens = 0  # Optional cap on answer tokens, 0 for none
+review_reasoning = "full"  # "full" keeps the <think> block, "off" skips it, "capped" limits it
+review_max_reasoning_tokens = 1024  # Used by "capped": past this the answer is requested without reasoning
+review_batch_size = 1  # Rows of one year/make/model reviewed per LLM call; 1 disables batching
+
+
+class OllamaBackend:
+    """One Ollama endpoint with its own prompt chain, concurrency cap and health state."""
+
+    def __init__(self, url, max_concurrent, model, temperature, keep_alive, timeout):
+        self.url = url
+        self.max_concurrent = max_concurrent
+        self.outstanding = 0
+        self.healthy = True
+        self.calls = 0
+        self.failures = 0
+        self.llm = OllamaLLM(
+            model=model,
+            base_url=url,
+            temperature=temperature,
+            keep_alive=keep_alive,
+            client_kwargs={
+                "timeout": timeout,
+                "limits": httpx.Limits(max_connections=max_concurrent,
+                                       max_keepalive_connections=max_concurrent),
+            },
+        )
+        prompt = ChatPromptTemplate.from_template(ReviewClient.template)
+        self.chain = prompt | self.llm
+        self.direct_chain = prompt | self.llm.bind(reasoning=False)  # Asks Ollama to skip the <think> block
+
+    def check(self):
+        try:
+            httpx.get(urljoin(self.url, "api/tags"), timeout=5).raise_for_status()
+            return True
+        except httpx.HTTPError:
+            return False
+
+
+class ReviewClient:
+    """Routes review prompts across a pool of Ollama backends.
+
+    Each backend keeps one long-lived chain and connection pool. A call goes
+    to the healthy backend with the fewest requests in flight, below its
+    max_per_backend cap. When a backend fails to connect, times out or
+    returns a 5xx, it is marked down and the call fails over to another
+    one. A background thread re-checks every backend every
+    ollama_health_interval seconds.
+
+    Responses are streamed. Reasoning and answer tokens are counted
+    separately. The stream is closed as soon as the answer passes max_words
+    or max_tokens. In "capped" reasoning mode, a <think> block longer than
+    max_reasoning_tokens is abandoned and the answer is requested again
+    without reasoning. Latencies and token counts are recorded for stats().
+    """
 
-# Function to generate a review using G4F API
-def generate_review(year, make, model_name, trim=None, **details):
     template = """Question: {question}
 
     Answer: Let's think step by step."""
 
-    prompt = ChatPromptTemplate.from_template(template)
-    model = OllamaLLM(
-        model="deepseek-r1",
-        base_url="http://127.0.0.1:11434/",
-        temperature=0.3  # Add temperature parameter to reduce hallucinations
-    )
-
-    chain = prompt | model
-    spec_lines = []
-    
-    # Filter out invalid values
-    for key, value in details.items():
-        if value and str(value).lower() not in ["n/a", "unknown", "unknown length", 
-                                              "unknown model type", "unknown hull", 
-                                              "unknown ccs", "unknown engines", 
-                                              "unknown hp", "unknown weight", 
-                                              "unknown fuel type"]:
-            spec_lines.append(f"{key}: {value}")
-    
-    # Build base prompt
-    base_prompt = f"Write a simple (max 150 word) review on {year} {make} {model_name}"
+    def __init__(self, urls=None, model=ollama_model, temperature=ollama_temperature,
+                 keep_alive=ollama_keep_alive, max_per_backend=ollama_max_per_backend,
+                 timeout=ollama_timeout, health_interval=ollama_health_interval,
+                 max_words=review_max_words, max_tokens=review_max_tokens,
+                 reasoning=review_reasoning, max_reasoning_tokens=review_max_reasoning_tokens):
+        self.model_name = model
+        self.temperature = temperature
+        self.timeout = timeout
+        self.max_words = max_words
+        self.max_tokens = max_tokens
+        self.reasoning = reasoning
+        self.max_reasoning_tokens = max_reasoning_tokens
+        self.backends = [OllamaBackend(url, max_per_backend, model, temperature, keep_alive, timeout)
+                         for url in (urls or ollama_urls)]
+        self.latencies = []
+        self.tokens = {"reasoning": 0, "answer": 0, "stopped_early": 0, "reasoning_capped": 0}
+        self.batches = {"calls": 0, "rows": 0, "fallbacks": 0}
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        self.check_backends()
+        self.stopped = threading.Event()
+        self.health_thread = threading.Thread(target=self._health_loop, args=(health_interval,), daemon=True)
+        self.health_thread.start()
+
+    @property
+    def cache_model(self):
+        """Model name plus the generation limits, so cached reviews only match the same settings."""
+        return f"{self.model_name}|{self.reasoning}|{self.max_words}|{self.max_tokens}"
+
+    @property
+    def capacity(self):
+        return sum(backend.max_concurrent for backend in self.backends)
+
+    def check_backends(self):
+        for backend in self.backends:
+            healthy = backend.check()
+            with self.condition:
+                if healthy != backend.healthy:
+                    print(f"Ollama backend {backend.url} is {'up' if healthy else 'down'}")
+                backend.healthy = healthy
+                self.condition.notify_all()
+
+    def _health_loop(self, interval):
+        while not self.stopped.wait(interval):
+            self.check_backends()
+
+    def _acquire(self, tried):
+        """Reserve the least busy healthy backend not in ``tried``.
+
+        Waits while every candidate is at its cap. Returns None when all
+        backends were tried, or none came back up within the timeout.
+        """
+        deadline = time.monotonic() + self.timeout
+        with self.condition:
+            while True:
+                remaining = [backend for backend in self.backends if backend not in tried]
+                if not remaining:
+                    return None
+                ready = [backend for backend in remaining
+                         if backend.healthy and backend.outstanding < backend.max_concurrent]
+                if ready:
+                    backend = min(ready, key=lambda backend: backend.outstanding)
+                    backend.outstanding += 1
+                    return backend
+                if not any(backend.healthy for backend in remaining) and time.monotonic() >= deadline:
+                    return None
+                self.condition.wait(1)
+
+    def _release(self, backend, failed=False):
+        with self.condition:
+            backend.outstanding -= 1
+            if failed:
+                backend.failures += 1
+                backend.healthy = False
+            self.condition.notify_all()
+
+    def invoke(self, question, scale=1):
+        """Return the answer to question; scale multiplies the word and token budgets."""
+        tried = set()
+        last_error = None
+        while True:
+            backend = self._acquire(tried)
+            if backend is None:
+                raise last_error or RuntimeError("No healthy Ollama backend available")
+            start = time.perf_counter()
+            try:
+                result = self._generate(backend, question, scale)
+            except (httpx.TransportError, ConnectionError, ResponseError) as e:
+                if isinstance(e, ResponseError) and e.status_code < 500:
+                    self._release(backend)
+                    raise
+                self._release(backend, failed=True)
+                print(f"Ollama backend {backend.url} failed ({type(e).__name__}: {e}), failing over")
+                tried.add(backend)
+                last_error = e
+                continue
+            except Exception:
+                self._release(backend)
+                raise
+            elapsed = time.perf_counter() - start
+            with self.condition:
+                backend.calls += 1
+                self.latencies.append(elapsed)
+            self._release(backend)
+            print(f"Review generated in {elapsed:.2f}s on {backend.url}")
+            return result
+
+    def _generate(self, backend, question, scale=1):
+        if self.reasoning == "off":
+            return self._consume(backend.direct_chain, question, scale)
+        reasoning_cap = self.max_reasoning_tokens if self.reasoning == "capped" else 0
+        answer = self._consume(backend.chain, question, scale, reasoning_cap)
+        if answer is None:
+            answer = self._consume(backend.direct_chain, question, scale)
+        return answer
+
+    def _consume(self, chain, question, scale=1, reasoning_cap=0):
+        """Stream one completion and return the answer with any <think> block removed.
+
+        Returns None when the reasoning ran past ``reasoning_cap`` tokens.
+        Each streamed chunk counts as one token.
+        """
+        max_words, max_tokens = self.max_words * scale, self.max_tokens * scale
+        text = ""
+        answer_start = None
+        reasoning_tokens = answer_tokens = 0
+        stopped_early = capped = False
+        stream = chain.stream({"question": question})
+        try:
+            for chunk in stream:
+                text += chunk
+                if answer_start is None:
+                    head = text.lstrip()
+                    if "</think>" in text:
+                        answer_start = text.index("</think>") + len("</think>")
+                        reasoning_tokens += 1
+                    elif head and not (head.startswith("<think>") or "<think>".startswith(head)):
+                        answer_start = 0  # The model skipped reasoning
+                        answer_tokens += 1
+                    else:
+                        reasoning_tokens += 1
+                        if reasoning_cap and reasoning_tokens > reasoning_cap:
+                            capped = True
+                            break
+                        continue
+                else:
+                    answer_tokens += 1
+
+                if (max_tokens and answer_tokens >= max_tokens) or \
+                        (max_words and len(text[answer_start:].split()) > max_words):
+                    stopped_early = True
+                    break
+        finally:
+            stream.close()  # Closing the stream drops the connection, which stops generation on the server
+
+        with self.lock:
+            self.tokens["reasoning"] += reasoning_tokens
+            self.tokens["answer"] += answer_tokens
+            self.tokens["stopped_early"] += stopped_early
+            self.tokens["reasoning_capped"] += capped
+        if capped:
+            print(f"Reasoning passed {reasoning_cap} tokens, asking again without it")
+            return None
+        answer = text[answer_start:] if answer_start is not None else text
+        if stopped_early and max_words:
+            answer = trim_to_words(answer, max_words)
+        return answer.strip()
+
+    def stats(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+        if not latencies:
+            return {"calls": 0}
+        return {
+            "calls": len(latencies),
+            "mean": sum(latencies) / len(latencies),
+            "p50": latencies[len(latencies) // 2],
+            "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            "max": latencies[-1],
+        }
+
+    def report(self):
+        stats = self.stats()
+        if stats["calls"]:
+            print(f"LLM calls: {stats['calls']}, latency mean {stats['mean']:.2f}s, "
+                  f"p50 {stats['p50']:.2f}s, p95 {stats['p95']:.2f}s, max {stats['max']:.2f}s")
+            print(f"Tokens: {self.tokens['reasoning']} reasoning, {self.tokens['answer']} answer; "
+                  f"{self.tokens['stopped_early']} answers cut off at the budget, "
+                  f"{self.tokens['reasoning_capped']} reasoning blocks capped")
+        if self.batches["calls"]:
+            print(f"Batched calls: {self.batches['calls']} covering {self.batches['rows']} rows, "
+                  f"{self.batches['fallbacks']} fell back to single-row calls")
+        for backend in self.backends:
+            print(f"  {backend.url}: {backend.calls} calls, {backend.failures} failures, "
+                  f"{'up' if backend.healthy else 'down'}")
+
+    def close(self):
+        self.stopped.set()
+
+
+def trim_to_words(text, max_words):
+    """Cut text after max_words words, back to the last full sentence if one ends in the second half."""
+    words = list(re.finditer(r"\S+", text))
+    if len(words) <= max_words:
+        return text
+    text = text[:words[max_words - 1].end()]
+    sentence_end = max(text.rfind("."), text.rfind("!"), text.rfind("?"))
+    return text[:sentence_end + 1] if sentence_end > len(text) // 2 else text
+
+
+_review_client = None
+_review_client_lock = threading.Lock()
+
+
+def get_review_client(urls=None, max_per_backend=ollama_max_per_backend, **options):
+    """Return the process-wide ReviewClient, creating it on first use."""
+    global _review_client
+    with _review_client_lock:
+        if _review_client is None:
+            _review_client = ReviewClient(urls, max_per_backend=max_per_backend, **options)
+        return _review_client
+
+
+class ReviewCache:
+    """Persistent review cache keyed on the normalised prompt, model and temperature.
+
+    Entries carry a last-used timestamp; once the cache grows past
+    max_entries the least recently used ones are evicted.
+    """
+
+    def __init__(self, cache_path=cache_file, max_entries=cache_max_entries):
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS reviews (key TEXT PRIMARY KEY, review TEXT NOT NULL, last_used REAL NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS reviews_last_used ON reviews (last_used)")
+        self.conn.commit()
+        self.size = self.conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(prompt, model, temperature):
+        normalized = " ".join(prompt.split()).casefold()
+        return hashlib.blake2b(f"{model}\x1f{temperature}\x1f{normalized}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute("SELECT review FROM reviews WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute("UPDATE reviews SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            return row[0]
+
+    def put(self, key, review):
+        with self.lock:
+            exists = self.conn.execute("SELECT 1 FROM reviews WHERE key = ?", (key,)).fetchone()
+            self.conn.execute("INSERT OR REPLACE INTO reviews (key, review, last_used) VALUES (?, ?, ?)",
+                              (key, review, time.time()))
+            if not exists:
+                self.size += 1
+            if self.size > self.max_entries:
+                excess = self.size - self.max_entries
+                self.conn.execute("DELETE FROM reviews WHERE key IN (SELECT key FROM reviews ORDER BY last_used LIMIT ?)",
+                                  (excess,))
+                self.evictions += excess
+                self.size -= excess
+            self.conn.commit()
+
+    def report(self):
+        lookups = self.hits + self.misses
+        if not lookups:
+            return
+        print(f"Review cache: {self.hits} hits, {self.misses} misses "
+              f"({self.hits / lookups:.1%} hit rate), {self.evictions} evicted, {self.size} stored")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+review_cache = None  # Set by main(); None disables caching
+
+
+# Spec values that carry no information and are left out of prompts
+invalid_spec_values = ["n/a", "unknown", "unknown length",
+                       "unknown model type", "unknown hull",
+                       "unknown ccs", "unknown engines",
+                       "unknown hp", "unknown weight",
+                       "unknown fuel type"]
+
+
+def describe_vehicle(year, make, model_name, trim=None, details=None):
+    """Return the vehicle's name and its usable spec lines."""
+    name = f"{year} {make} {model_name}"
     if trim:
-        base_prompt += f" {trim}"
-    
+        name += f" {trim}"
+    spec_lines = [f"{key}: {value}" for key, value in (details or {}).items()
+                  if value and str(value).lower() not in invalid_spec_values]
+    return name, spec_lines
+
+
+def build_prompt(year, make, model_name, trim=None, **details):
+    name, spec_lines = describe_vehicle(year, make, model_name, trim, details)
+
+    # Build base prompt
+    base_prompt = f"Write a simple (max 150 word) review on {name}"
+
     # Add specifications if available
     if spec_lines:
         spec_text = "\n".join(spec_lines)
@@ -58,106 +445,469 @@ def generate_review(year, make, model_name, trim=None, **details):
 
     # Example review template (fixed syntax)
     #example_review = """The 2023 Acura Integra Sedan 4D offers an excellent balance of style, reliability, and value for its price. With a sleek design that combines modern aesthetics, it captures attention while maintaining comfort and efficiency. Under the hood, it features a 1.5L turbocharged engine delivering impressive power without compromising on fuel economy. Inside, the cabin is comfortable, equipped with supportive seats and a user-friendly infotainment system, making it ideal for daily commutes or casual drives. Its overall value ensures you get high-quality performance at an accessible price point, making it a top choice for those seeking a reliable yet stylish car."""
+    return base_prompt
+
+
+def build_batch_prompt(vehicles):
+    """One prompt asking for a JSON array with a review per (year, make, model, trim, details) tuple."""
+    lines = [f"Write a simple (max 150 word) review for each of these {len(vehicles)} vehicles:"]
+    for number, (year, make, model_name, trim, details) in enumerate(vehicles, start=1):
+        name, spec_lines = describe_vehicle(year, make, model_name, trim, details)
+        lines.append(f"{number}. {name}" + (" with these specifications:" if spec_lines else ""))
+        lines.extend(f"   {line}" for line in spec_lines)
+    lines.append(f"Answer with only a JSON array of {len(vehicles)} strings, "
+                 f"one review per vehicle, in the same order.")
+    return "\n".join(lines)
+
+
+def parse_batch(answer, count):
+    """Return the reviews in a JSON array answer, or None unless it holds exactly count non-empty strings."""
+    start, end = answer.find("["), answer.rfind("]")
+    if start < 0 or end < start:
+        return None
+    try:
+        reviews = json.loads(answer[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(reviews, list) or len(reviews) != count or \
+            not all(isinstance(review, str) and review.strip() for review in reviews):
+        return None
+    return [review.strip() for review in reviews]
+
+
+def _cache_key(client, prompt):
+    return review_cache.key(prompt, client.cache_model, client.temperature) if review_cache else None
+
+
+# Function to generate a review using the shared Ollama client
+def generate_review(year, make, model_name, trim=None, **details):
+    base_prompt = build_prompt(year, make, model_name, trim, **details)
 
     # Print the actual prompt being used
     print(f"Generating review with prompt: {base_prompt}")
-    
-    result = chain.invoke({"question": f"{base_prompt}"})
-    return result.split('</think>')[1] if '</think>' in result else result
-    
 
-# Function to process sheets based on the selected types
-def process_sheets(selected_sheets):
-    # Load the Excel file
-    workbook = openpyxl.load_workbook(input_file)
+    client = get_review_client()
+    key = _cache_key(client, base_prompt)
+    if key:
+        cached = review_cache.get(key)
+        if cached is not None:
+            print("Review served from cache")
+            return cached
+
+    review = client.invoke(base_prompt)
+    if key:
+        review_cache.put(key, review)
+    return review
+
+
+def generate_batch(vehicles):
+    """Review several (year, make, model, trim, details) tuples with one LLM call.
+
+    Cached reviews are reused. The rest are requested together, and their
+    reviews are cached under their single-row prompts. If the answer can't
+    be parsed, each row falls back to generate_review. Returns one review
+    or exception per vehicle.
+    """
+    client = get_review_client()
+    reviews = [None] * len(vehicles)
+    keys = [_cache_key(client, build_prompt(*vehicle[:4], **vehicle[4])) for vehicle in vehicles]
+    for i, key in enumerate(keys):
+        if key:
+            reviews[i] = review_cache.get(key)
+
+    missing = [i for i, review in enumerate(reviews) if review is None]
+    if len(missing) > 1:
+        year, make, model_name = vehicles[missing[0]][:3]
+        print(f"Generating {len(missing)} reviews in one call for {year} {make} {model_name}")
+        # Leave room for one more review's worth of words for the JSON around the reviews
+        answer = client.invoke(build_batch_prompt([vehicles[i] for i in missing]), scale=len(missing) + 1)
+        parsed = parse_batch(answer, len(missing))
+        with client.lock:
+            client.batches["calls"] += 1
+            client.batches["rows"] += len(missing)
+            client.batches["fallbacks"] += parsed is None
+        if parsed is None:
+            print("Batched answer was not a valid JSON array of reviews, falling back to one call per row")
+        else:
+            for i, review in zip(missing, parsed):
+                if client.max_words:
+                    review = trim_to_words(review, client.max_words)
+                reviews[i] = review
+                if keys[i]:
+                    review_cache.put(keys[i], review)
+
+    for i, review in enumerate(reviews):
+        if review is None:
+            try:
+                reviews[i] = generate_review(*vehicles[i][:4], **vehicles[i][4])
+            except Exception as e:
+                reviews[i] = e
+    return reviews
+
+
+def resolve_source(choice):
+    """'sqlite' or 'xlsx' for a --source choice; 'auto' picks the file written last."""
+    if choice != 'auto':
+        return choice
+    if not os.path.exists(database_file):
+        return 'xlsx'
+    if not os.path.exists(input_file):
+        return 'sqlite'
+    # Committed SQLite writes may only have reached the -wal file so far
+    written = max(os.path.getmtime(path) for path in (database_file, database_file + '-wal') if os.path.exists(path))
+    return 'sqlite' if written > os.path.getmtime(input_file) else 'xlsx'
+
+
+def list_sheets():
+    """Sheet names available in the dataset, from the SQLite store or the workbook."""
+    if dataset_source == 'sqlite':
+        conn = sqlite3.connect(database_file)
+        try:
+            tables = [name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        finally:
+            conn.close()
+        return [table.capitalize() for table in tables]
+    workbook = openpyxl.load_workbook(input_file, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def iter_sheet_rows(sheet_name):
+    """Yield (columns, row values) for a sheet without loading it into memory.
+
+    The first item is the header; rows then stream from SQLite with
+    fetchmany or from a read-only openpyxl workbook.
+    """
+    if dataset_source == 'sqlite':
+        conn = sqlite3.connect(database_file)
+        try:
+            cursor = conn.execute(f'SELECT * FROM "{sheet_name.lower()}" ORDER BY rowid')
+            columns = [description[0] for description in cursor.description]
+            keep = [i for i, column in enumerate(columns) if column != 'row_hash']
+            yield [columns[i] for i in keep]
+            while True:
+                batch = cursor.fetchmany(chunk_size)
+                if not batch:
+                    break
+                for values in batch:
+                    yield [str(values[i]) if isinstance(values[i], int) else values[i] for i in keep]
+        finally:
+            conn.close()
+        return
 
+    workbook = openpyxl.load_workbook(input_file, read_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        yield [str(column) if column is not None else '' for column in header]
+        # Read-only mode drops trailing empty cells, so pad rows back to the header width
+        for values in rows:
+            yield list(values) + [None] * (len(header) - len(values))
+    finally:
+        workbook.close()
+
+
+def read_sheet(sheet_name):
+    """Return the sheet's columns and a generator of row chunks.
+
+    Each chunk is a list of at most chunk_size (index, row dict) pairs, with
+    the index starting at 1 for the first row after the header. Columns are
+    None when the sheet is completely empty.
+    """
+    rows = iter_sheet_rows(sheet_name)
+    columns = next(rows, None)
+
+    def chunks():
+        numbered = enumerate(rows, start=1)
+        while True:
+            chunk = list(islice(numbered, chunk_size))
+            if not chunk:
+                break
+            yield [(index, dict(zip(columns, values))) for index, values in chunk]
+
+    return columns, chunks()
+
+
+def _normalize(value):
+    return "" if value is None else str(value).strip()
+
+
+def _hash_values(values):
+    return hashlib.blake2b("\x1f".join(values).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def row_key(sheet_name, row):
+    """Stable key for a row, hashed from its identifying columns."""
+    columns = key_columns.get(sheet_name.lower()) or sorted(c for c in row if c != 'Blurb')
+    return _hash_values(_normalize(row.get(column)) for column in columns)
+
+
+def spec_hash(row):
+    """Hash of every column the review depends on, used to spot changed rows."""
+    return _hash_values(f"{column}={_normalize(row[column])}" for column in sorted(row) if column != 'Blurb')
+
+
+class ResumeIndex:
+    """Rows already written to a sheet's output CSV, as row key -> spec hash.
+
+    This is the snapshot the next run diffs the dataset against. It is kept
+    next to the CSV as <Sheet>.keys, one "key<TAB>spec hash" line per row,
+    and rebuilt from the CSV itself when missing or in the older key-only
+    format.
+    """
+
+    def __init__(self, sheet_name, output_csv_path):
+        self.sheet_name = sheet_name
+        self.csv_path = output_csv_path
+        self.path = os.path.splitext(output_csv_path)[0] + '.keys'
+        self.keys = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    key, _, spec = line.strip().partition('\t')
+                    if key and not spec:
+                        self.keys = {}
+                        break
+                    if key:
+                        self.keys[key] = spec
+        if not self.keys and os.path.exists(output_csv_path):
+            self.rebuild()
+        self.file = open(self.path, 'a', encoding='utf-8')
+
+    def _csv_rows(self):
+        with open(self.csv_path, encoding='utf-8-sig', newline='') as f:
+            yield from csv.DictReader(f)
+
+    def _write(self):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.writelines(f"{key}\t{spec}\n" for key, spec in self.keys.items())
+        os.replace(temp_path, self.path)
+
+    def rebuild(self):
+        print(f"Building resume index from {self.csv_path}...")
+        self.keys = {row_key(self.sheet_name, row): spec_hash(row) for row in self._csv_rows()}
+        self._write()
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def get(self, key):
+        return self.keys.get(key)
+
+    def add(self, key, spec):
+        self.keys[key] = spec
+        self.file.write(f"{key}\t{spec}\n")
+        self.file.flush()
+
+    def prune(self, current):
+        """Drop output rows whose key is gone or whose specs no longer match ``current``.
+
+        The CSV is rewritten to a temporary file and swapped in. Returns the
+        number of rows removed.
+        """
+        self.file.close()
+        temp_path = f"{self.csv_path}.tmp"
+        removed = 0
+        kept = {}
+        with open(self.csv_path, encoding='utf-8-sig', newline='') as src, \
+                open(temp_path, 'w', encoding='utf-8-sig', newline='') as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
+            header = next(reader, None)
+            if header is not None:
+                writer.writerow(header)
+            for values in reader:
+                row = dict(zip(header, values))
+                key, spec = row_key(self.sheet_name, row), spec_hash(row)
+                if current.get(key) != spec or key in kept:
+                    removed += 1
+                    continue
+                kept[key] = spec
+                writer.writerow(values)
+        os.replace(temp_path, self.csv_path)
+        self.keys = kept
+        self._write()
+        self.file = open(self.path, 'a', encoding='utf-8')
+        return removed
+
+    def close(self):
+        self.file.close()
+
+
+def review_args(row, is_boats):
+    """The (year, make, model, trim, details) a row is reviewed with."""
+    year = row.get('Year', 'unknown year')
+    make = row.get('Make', 'unknown make')
+    model = row.get('Model', 'unknown model')
+
+    if is_boats:
+        # For boats, use additional details in the review
+        details = {
+            "Length": row.get('Length', 'unknown length'),
+            "Model Type": row.get('Model Type', 'unknown model type'),
+            "Hull": row.get('Hull', 'unknown hull'),
+            "CC's": row.get("CC's", 'unknown CCs'),
+            "Engine(s)": row.get('Engine(s)', 'unknown engines'),
+            "HP": row.get('HP', 'unknown HP'),
+            "Weight (lbs)": row.get('Weight (lbs)', 'unknown weight'),
+            "Fuel Type": row.get('Fuel Type', 'unknown fuel type')
+        }
+        return year, make, model, None, details
+
+    # For other vehicle types, use the standard review generation
+    trim = row.get('Trim', 'unknown trim')
+    return year, make, model, trim, {}
+
+
+def review_row(row, is_boats):
+    # Generate a review for the current row
+    year, make, model, trim, details = review_args(row, is_boats)
+    return generate_review(year, make, model, trim, **details)
+
+
+def review_batch(rows, is_boats):
+    """Reviews for a list of rows, one per row; several rows share one LLM call."""
+    if len(rows) == 1:
+        return [review_row(rows[0], is_boats)]
+    return generate_batch([review_args(row, is_boats) for row in rows])
+
+
+def batched_rows(rows, batch_size):
+    """Group consecutive (index, row) pairs of the same year/make/model into lists of at most batch_size."""
+    batch, group = [], None
+    for index, row in rows:
+        key = (row.get('Year'), row.get('Make'), row.get('Model'))
+        if batch and (key != group or len(batch) >= batch_size):
+            yield batch
+            batch = []
+        batch.append((index, row))
+        group = key
+    if batch:
+        yield batch
+
+
+def generate_in_order(rows, is_boats, workers, batch_size=1):
+    """Review rows on a pool of ``workers`` threads, yielding results in input order.
+
+    Rows are grouped by batched_rows and each group is one task. Yields
+    (index, row, review) where review is the raised exception if the call
+    failed. At most ``2 * workers`` tasks are in flight, so a slow row only
+    holds back output, never memory.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        window = deque()
+        for batch in batched_rows(rows, max(1, batch_size)):
+            for _, row in batch:
+                row.setdefault('Blurb', '')
+            window.append((batch, executor.submit(review_batch, [row for _, row in batch], is_boats)))
+            if len(window) >= 2 * workers:
+                yield from _resolve(window.popleft())
+        while window:
+            yield from _resolve(window.popleft())
+
+
+def _resolve(item):
+    batch, future = item
+    try:
+        reviews = future.result()
+    except Exception as e:
+        reviews = [e] * len(batch)
+    for (index, row), review in zip(batch, reviews):
+        yield index, row, review
+
+
+# Function to process sheets based on the selected types
+def process_sheets(selected_sheets, workers=1, batch_size=1, prune=False):
     # Ensure output folder exists
     os.makedirs(output_folder, exist_ok=True)
+    print(f"Reading {database_file if dataset_source == 'sqlite' else input_file}")
 
-    for sheet_name in workbook.sheetnames:
+    for sheet_name in list_sheets():
         if sheet_name.lower() not in selected_sheets:
             continue
 
         print(f"Processing sheet: {sheet_name}")
-        sheet = workbook[sheet_name]
-        df = pd.DataFrame(sheet.values)
+        columns, chunks = read_sheet(sheet_name)
 
         # Check if the sheet has data
-        if df.empty:
+        if columns is None:
             print(f"No data found in sheet: {sheet_name}. Skipping...")
             continue
 
-        # Use the first row as column headers
-        df.columns = df.iloc[0]
-        df = df[1:]  # Skip the header row
-
         # Determine if this is the boats sheet
         is_boats = sheet_name.lower() == "boats"
 
         # Add a Blurb column if it doesn't exist
-        if 'Blurb' not in df.columns:
-            df['Blurb'] = ''
+        if 'Blurb' not in columns:
+            columns = columns + ['Blurb']
 
         # Output CSV file for the current sheet
         output_csv_path = f"{output_folder}/{sheet_name}.csv"
 
-        # Check if the CSV file already exists
         file_exists = os.path.exists(output_csv_path)
-        processed_rows = set()
-        if file_exists:
-            existing_df = pd.read_csv(output_csv_path, encoding='utf-8-sig')
-            processed_rows = set(existing_df.index)
-
-        with open(output_csv_path, mode='a', encoding='utf-8-sig', newline='') as f:
-            # Write headers if the file doesn't exist
-            if not file_exists:
-                f.write(','.join(df.columns) + '\n')
-
-            for index, row in df.iterrows():
-                # Skip rows already processed
-                if index in processed_rows:
-                    continue
+        completed = ResumeIndex(sheet_name, output_csv_path)
+        snapshot = len(completed.keys)
+        current = {}  # Row key -> spec hash of every dataset row, for pruning afterwards
+        counts = {'new': 0, 'changed': 0}
 
-                try:
-                    # Generate a review for the current row
-                    year = row.get('Year', 'unknown year')
-                    make = row.get('Make', 'unknown make')
-                    model = row.get('Model', 'unknown model')
-
-                    if is_boats:
-                        # For boats, use additional details in the review
-                        details = {
-                            "Length": row.get('Length', 'unknown length'),
-                            "Model Type": row.get('Model Type', 'unknown model type'),
-                            "Hull": row.get('Hull', 'unknown hull'),
-                            "CC's": row.get("CC's", 'unknown CCs'),
-                            "Engine(s)": row.get('Engine(s)', 'unknown engines'),
-                            "HP": row.get('HP', 'unknown HP'),
-                            "Weight (lbs)": row.get('Weight (lbs)', 'unknown weight'),
-                            "Fuel Type": row.get('Fuel Type', 'unknown fuel type')
-                        }
-                        review = generate_review(year, make, model, **details)
-                    else:
-                        # For other vehicle types, use the standard review generation
-                        trim = row.get('Trim', 'unknown trim')
-                        review = generate_review(year, make, model, trim)
+        def pending_rows():
+            """Diff the dataset against the last reviewed snapshot, streaming new and changed rows to the LLM."""
+            for chunk in chunks:
+                for index, row in chunk:
+                    key = row_key(sheet_name, row)
+                    if key in current:
+                        continue
+                    current[key] = spec_hash(row)
+                    reviewed = completed.get(key)
+                    if reviewed == current[key]:
+                        continue
+                    counts['new' if reviewed is None else 'changed'] += 1
+                    yield index, row
+
+        try:
+            with open(output_csv_path, mode='a', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                # Write headers if the file doesn't exist
+                if not file_exists:
+                    writer.writerow(columns)
+
+                for index, row, review in generate_in_order(pending_rows(), is_boats, workers, batch_size):
+                    if isinstance(review, Exception):
+                        print(f"Error generating blurb for row {index}: {str(review)}")
+                        continue
 
                     print(f"Generated review: {review}\n\n")
 
-                    # Validate review for allowed characters
                     row['Blurb'] = review
-                    # Write the row to the CSV, ensuring the review is in a single cell
-                    row_data = [str(val) if i != 'Blurb' else f'"{review}"' for i, val in row.items()]
-                    f.write(','.join(row_data) + '\n')
+                    writer.writerow([row.get(column) for column in columns])
+                    f.flush()  # Keep the CSV current so an interrupted run resumes from here
+                    completed.add(row_key(sheet_name, row), spec_hash(row))
 
-                except Exception as retry_error:
-                    print(f"Retrying due to error: {retry_error}")
-                    continue
-                except Exception as e:
-                    print(f"Error generating blurb for row {index}: {str(e)}")
-                    continue
+            removed = len(completed.keys.keys() - current.keys())
+            print(f"{len(current) - counts['new'] - counts['changed']} rows unchanged, {counts['new']} new, "
+                  f"{counts['changed']} changed, {removed} removed")
+
+            # Blurbs of removed rows and the old specs of changed rows
+            stale = counts['changed'] + removed
+            if file_exists and stale:
+                if not prune:
+                    print(f"Kept {stale} stale blurbs in {output_csv_path}; run with --prune to drop them")
+                elif removed > snapshot / 2:
+                    # More likely an outdated or partial dataset than half the vehicles being delisted
+                    print(f"Not pruning {output_csv_path}: {removed} of {snapshot} reviewed rows are missing "
+                          f"from the dataset; check --source")
+                else:
+                    print(f"Pruned {completed.prune(current)} stale blurbs from {output_csv_path}")
+        finally:
+            completed.close()
 
 def main():
+    global review_cache, dataset_source
     parser = argparse.ArgumentParser(description="Generate vehicle reviews.")
     parser.add_argument(
         "-c", action="store_true", help="Generate reviews for Cars"
@@ -174,6 +924,53 @@ def main():
     parser.add_argument(
         "-all", action="store_true", help="Generate reviews for all vehicle types (Cars, RVs, Boats, Motorcycles)"
     )
+    parser.add_argument(
+        "--workers", type=int,
+        help="Reviews generated at once (default: the combined cap of all Ollama hosts)"
+    )
+    parser.add_argument(
+        "--ollama-url", action="append", metavar="URL",
+        help="Ollama host to send reviews to; repeat for several (default: OLLAMA_HOSTS or the local server)"
+    )
+    parser.add_argument(
+        "--per-backend", type=int, default=ollama_max_per_backend,
+        help="Requests in flight per Ollama host (default: OLLAMA_NUM_PARALLEL or 4)"
+    )
+    parser.add_argument(
+        "--max-words", type=int, default=review_max_words,
+        help=f"Stop generating once a review passes this many words, 0 for no limit (default: {review_max_words})"
+    )
+    parser.add_argument(
+        "--max-tokens", type=int, default=review_max_tokens,
+        help="Stop generating after this many answer tokens, 0 for no limit (default: 0)"
+    )
+    parser.add_argument(
+        "--reasoning", choices=["full", "off", "capped"], default=review_reasoning,
+        help="Let the model reason before answering, skip reasoning, or cap it with --max-reasoning-tokens"
+    )
+    parser.add_argument(
+        "--max-reasoning-tokens", type=int, default=review_max_reasoning_tokens,
+        help=f"Reasoning budget for --reasoning capped (default: {review_max_reasoning_tokens})"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=review_batch_size,
+        help="Review up to this many rows of the same year/make/model in one LLM call (default: 1, no batching)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Always call the LLM instead of reusing cached reviews"
+    )
+    parser.add_argument(
+        "--source", choices=["auto", "sqlite", "xlsx"], default=dataset_source,
+        help=f"Read the dataset from {database_file} or {input_file} (default: whichever was written last)"
+    )
+    parser.add_argument(
+        "--prune", action="store_true",
+        help="Drop blurbs of rows that changed or are gone from the dataset (skipped if most rows are gone)"
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=cache_max_entries,
+        help=f"Maximum cached reviews kept in {cache_file} (default: {cache_max_entries})"
+    )
     args = parser.parse_args()
 
     # If -all is provided, set all other flags to True
@@ -202,11 +999,26 @@ def main():
     # Start tracking execution time
     start_time = time.time()
 
+    review_client = get_review_client(args.ollama_url, max(1, args.per_backend),
+                                      max_words=max(0, args.max_words), max_tokens=max(0, args.max_tokens),
+                                      reasoning=args.reasoning,
+                                      max_reasoning_tokens=max(1, args.max_reasoning_tokens))
+    workers = max(1, args.workers or review_client.capacity)
+    dataset_source = resolve_source(args.source)
+    if not args.no_cache:
+        review_cache = ReviewCache(max_entries=max(1, args.cache_size))
+
     try:
-        process_sheets(selected_sheets)
+        process_sheets(selected_sheets, workers, max(1, args.batch_size), args.prune)
     except Exception as e:
         print(f"An error occurred: {str(e)}")
     finally:
+        review_client.report()
+        review_client.close()
+        if review_cache:
+            review_cache.report()
+            review_cache.close()
+
         # Calculate execution time
         end_time = time.time()
         execution_time = end_time - start_time
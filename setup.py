@@ -10,6 +10,8 @@ required_libraries = [
     "playwright",
     "g4f",
     "playwright-stealth",
+    "httpx",             # Browserless fetch backend
+    "beautifulsoup4",    # HTML parsing for the browserless backend
     "ollama",
     "langchain-core",    # For langchain_core
     "langchain-ollama",  # For langchain_ollama integration